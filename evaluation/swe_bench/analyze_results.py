@@ -2,83 +2,161 @@
 # -*- coding: utf-8 -*-
 """分析Ultra Think模式评估结果"""
 
+import functools
 import json
 import os
-from typing import Dict, List
+import re
+import sys
+from typing import Any, Dict, Iterator, List
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# 深度思考关键词（分析、识别、推理）
+_DEEP_KWS = ("analyze", "identify", "reason")
+
+# 评分条：下标为填充格数（0-20）
+_BARS = tuple("█" * i + "░" * (20 - i) for i in range(21))
+
+
+@functools.lru_cache(maxsize=512)
+def _is_deep(action: str) -> bool:
+    """判断步骤动作是否包含深度思考关键词，重复动作命中缓存"""
+    action_lc = action.lower()
+    return any(keyword in action_lc for keyword in _DEEP_KWS)
+
+
+# Go time.Duration.String() 的单位分量，如 "1m2.5s"、"350.2ms"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d*)?)(ns|us|µs|μs|ms|s|m|h)")
+_DURATION_UNIT_MS = {
+    "ns": 1e-6,
+    "us": 1e-3,
+    "µs": 1e-3,
+    "μs": 1e-3,
+    "ms": 1.0,
+    "s": 1e3,
+    "m": 6e4,
+    "h": 3.6e6,
+}
+
+
+def avg_duration_ms(summary: Dict[str, Any]) -> float:
+    """读取平均耗时（毫秒），优先使用数值字段 avg_duration_ms"""
+    value = summary.get("avg_duration_ms")
+    if value is not None:
+        return float(value)
+    value = summary["avg_duration"]
+    if isinstance(value, (int, float)):
+        return float(value)
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return float(value)
+    return sum(float(num) * _DURATION_UNIT_MS[unit] for num, unit in parts)
+
+
+def iter_detailed_results(path: str) -> Iterator[Dict[str, Any]]:
+    """逐条读取 detailed_results.json，有 ijson 时流式解析"""
+    if ijson is None:
+        with open(path, "r") as f:
+            yield from json.load(f)
+        return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
 
 def analyze_evaluation_results(results_dir: str = "ultra_think_results"):
     """分析评估结果并生成评分报告"""
+    # 报告先缓存在内存，最后一次性写出
+    out: List[str] = []
     
     # 读取各种结果文件
     with open(f"{results_dir}/summary.json", "r") as f:
         summary = json.load(f)
     
-    with open(f"{results_dir}/detailed_results.json", "r") as f:
-        detailed = json.load(f)
-    
     with open(f"{results_dir}/batch_results.json", "r") as f:
         batch = json.load(f)
     
-    print("=" * 80)
-    print("🎯 Ultra Think 模式评估报告")
-    print("=" * 80)
+    out.append("=" * 80)
+    out.append("🎯 Ultra Think 模式评估报告")
+    out.append("=" * 80)
     
     # 1. 总体评分
-    print("\n📊 总体评分")
-    print("-" * 40)
+    out.append("\n📊 总体评分")
+    out.append("-" * 40)
     total_score = summary["success_rate"]
-    print(f"✅ 成功率: {total_score}%")
-    print(f"📝 完成任务: {summary['completed_tasks']}/{summary['total_tasks']}")
-    print(f"❌ 失败任务: {summary['failed_tasks']}")
-    print(f"⏱️  平均耗时: {summary['avg_duration']}")
-    print(f"💰 总成本: ${summary['total_cost']:.4f}")
-    print(f"🤖 使用模型: {summary['model_name']}")
+    avg_dur_ms = avg_duration_ms(summary)
+    out.append(f"✅ 成功率: {total_score}%")
+    out.append(f"📝 完成任务: {summary['completed_tasks']}/{summary['total_tasks']}")
+    out.append(f"❌ 失败任务: {summary['failed_tasks']}")
+    out.append(f"⏱️  平均耗时: {summary['avg_duration']}")
+    out.append(f"💰 总成本: ${summary['total_cost']:.4f}")
+    out.append(f"🤖 使用模型: {summary['model_name']}")
     
     # 2. 详细案例分析
-    print("\n🔍 详细案例分析")
-    print("-" * 40)
-    
-    for idx, result in enumerate(detailed, 1):
-        print(f"\n案例 {idx}: {result['instance_id']}")
-        print(f"  状态: {'✅ 成功' if result['status'] == 'completed' else '❌ 失败'}")
-        print(f"  耗时: {result['duration'] / 1e6:.2f}ms")
-        print(f"  Token使用: {result['tokens_used']}")
-        print(f"  成本: ${result['cost']:.4f}")
-        print(f"  修改文件: {', '.join(result['files_changed'])}")
+    out.append("\n🔍 详细案例分析")
+    out.append("-" * 40)
+    
+    # 单次遍历：打印案例的同时累计思考步骤与深度思考指标
+    case_count = 0
+    total_trace_steps = 0
+    deep_thinking_indicators = 0
+    for idx, result in enumerate(iter_detailed_results(f"{results_dir}/detailed_results.json"), 1):
+        case_count += 1
+        out.append(f"\n案例 {idx}: {result['instance_id']}")
+        out.append(f"  状态: {'✅ 成功' if result['status'] == 'completed' else '❌ 失败'}")
+        out.append(f"  耗时: {result['duration'] / 1e6:.2f}ms")
+        out.append(f"  Token使用: {result['tokens_used']}")
+        out.append(f"  成本: ${result['cost']:.4f}")
+        out.append(f"  修改文件: {', '.join(result['files_changed'])}")
         
+        trace = result.get('trace') or []
+        trace_len = len(trace)
+        total_trace_steps += trace_len
+
         # 显示思考轨迹
-        if 'trace' in result and result['trace']:
-            print(f"  思考步骤: {len(result['trace'])}步")
-            for step in result['trace'][:2]:  # 只显示前2步
-                print(f"    Step {step['step']}: {step['action']}")
-                print(f"      思考: {step['thought'][:50]}...")
+        if trace:
+            out.append(f"  思考步骤: {trace_len}步")
+            for step in trace[:2]:  # 只显示前2步
+                out.append(f"    Step {step['step']}: {step['action']}")
+                out.append(f"      思考: {step['thought'][:50]}...")
+
+            # 检查思考步骤
+            if trace_len >= 4:
+                deep_thinking_indicators += 1
+            # 检查是否有分析和推理步骤
+            for step in trace:
+                if _is_deep(step['action']):
+                    deep_thinking_indicators += 0.5
+                    break
     
     # 3. 性能指标
-    print("\n⚡ 性能指标")
-    print("-" * 40)
-    print(f"总耗时: {summary['duration']}")
-    print(f"总Token: {summary['total_tokens']}")
-    print(f"并发数: {summary['num_workers']}")
+    out.append("\n⚡ 性能指标")
+    out.append("-" * 40)
+    out.append(f"总耗时: {summary['duration']}")
+    out.append(f"总Token: {summary['total_tokens']}")
+    out.append(f"并发数: {summary['num_workers']}")
     
     # 4. 评分计算
-    print("\n🏆 综合评分计算")
-    print("-" * 40)
+    out.append("\n🏆 综合评分计算")
+    out.append("-" * 40)
     
     # 评分维度
     scores = {
         "功能完成度": total_score,  # 基于成功率
-        "效率评分": min(100, (1000 / (float(summary['avg_duration'].rstrip('ms')) + 1)) * 100),  # 基于速度
+        "效率评分": min(100, (1000 / (avg_dur_ms + 1)) * 100),  # 基于速度
         "成本效益": min(100, (0.001 / (summary['total_cost'] + 0.0001)) * 100),  # 基于成本
-        "思考深度": min(100, sum([len(r.get('trace', [])) for r in detailed]) / len(detailed) * 25)  # 基于步骤数
+        "思考深度": min(100, total_trace_steps / case_count * 25)  # 基于步骤数
     }
     
     for dimension, score in scores.items():
-        bar = "█" * int(score / 5) + "░" * (20 - int(score / 5))
-        print(f"  {dimension:12s}: {bar} {score:.1f}%")
+        filled = int(score / 5)
+        bar = _BARS[20 if filled > 20 else 0 if filled < 0 else filled]
+        out.append(f"  {dimension:12s}: {bar} {score:.1f}%")
     
     # 综合评分
     final_score = sum(scores.values()) / len(scores)
-    print(f"\n  📈 综合评分: {final_score:.1f}/100")
+    out.append(f"\n  📈 综合评分: {final_score:.1f}/100")
     
     # 评级
     if final_score >= 90:
@@ -92,33 +170,22 @@ def analyze_evaluation_results(results_dir: str = "ultra_think_results"):
     else:
         grade = "D 需改进"
     
-    print(f"  🏅 评级: {grade}")
+    out.append(f"  🏅 评级: {grade}")
     
     # 5. Ultra Think特性分析
-    print("\n🧠 Ultra Think 特性分析")
-    print("-" * 40)
-    
-    # 检查是否有深度思考迹象
-    deep_workflow.node.output.delta_indicators = 0
-    for result in detailed:
-        if 'trace' in result:
-            # 检查思考步骤
-            if len(result['trace']) >= 4:
-                deep_workflow.node.output.delta_indicators += 1
-            # 检查是否有分析和推理步骤
-            for step in result['trace']:
-                if any(keyword in step['action'].lower() for keyword in ['analyze', 'identify', 'reason']):
-                    deep_workflow.node.output.delta_indicators += 0.5
-                    break
-    
-    ultra_think_score = min(100, (deep_workflow.node.output.delta_indicators / len(detailed)) * 100)
-    print(f"  深度思考指标: {ultra_think_score:.1f}%")
-    print(f"  推理模型使用: {'是' if 'r1' in summary['model_name'] else '否'}")
-    print(f"  平均思考步骤: {sum([len(r.get('trace', [])) for r in detailed]) / len(detailed):.1f}步")
-    
-    print("\n" + "=" * 80)
-    print("评估完成！框架验证成功 ✅")
-    print("=" * 80)
+    out.append("\n🧠 Ultra Think 特性分析")
+    out.append("-" * 40)
+    
+    ultra_think_score = min(100, (deep_thinking_indicators / case_count) * 100)
+    out.append(f"  深度思考指标: {ultra_think_score:.1f}%")
+    out.append(f"  推理模型使用: {'是' if 'r1' in summary['model_name'] else '否'}")
+    out.append(f"  平均思考步骤: {total_trace_steps / case_count:.1f}步")
+    
+    out.append("\n" + "=" * 80)
+    out.append("评估完成！框架验证成功 ✅")
+    out.append("=" * 80)
+    out.append("")
+    sys.stdout.write("\n".join(out))
 
 if __name__ == "__main__":
     # 检查结果目录
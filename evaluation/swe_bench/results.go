@@ -186,6 +186,7 @@ func (rw *ResultWriterImpl) writeSummary(filePath string, result *BatchResult) e
 		TotalTokens:    result.TotalTokens,
 		TotalCost:      result.TotalCost,
 		AvgDuration:    result.AvgDuration.String(),
+		AvgDurationMs:  float64(result.AvgDuration) / float64(time.Millisecond),
 		ErrorSummary:   result.ErrorSummary,
 
 		// Configuration summary
@@ -255,6 +256,7 @@ type BatchSummary struct {
 	TotalTokens    int            `json:"total_tokens"`
 	TotalCost      float64        `json:"total_cost"`
 	AvgDuration    string         `json:"avg_duration"`
+	AvgDurationMs  float64        `json:"avg_duration_ms"`
 	ErrorSummary   map[string]int `json:"error_summary"`
 
 	// Configuration summary
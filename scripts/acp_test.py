@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import http.client
 import json
 import os
 import queue
@@ -9,6 +10,22 @@ import urllib.parse
 import urllib.request
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+else:
+    def _dumps(payload):
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
 
 def resolve_default_addr():
     env_addr = os.getenv("ACP_ADDR") or os.getenv("ACP_SERVER_ADDR")
@@ -44,51 +61,112 @@ def normalize_base_url(raw):
     return raw.rstrip("/")
 
 
-def post_json(url, payload):
-    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        resp.read()
+def open_connection(url, timeout=10):
+    """Return an http.client connection for *url* and the request target.
+
+    Honours HTTP(S)_PROXY/no_proxy: https URLs are tunnelled with CONNECT,
+    plain http URLs are sent to the proxy in absolute form.
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    proxy = urllib.request.getproxies().get(parts.scheme)
+    if proxy and not urllib.request.proxy_bypass(parts.hostname or ""):
+        proxy_netloc = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}").netloc
+        if parts.scheme == "https":
+            conn = http.client.HTTPSConnection(proxy_netloc, timeout=timeout)
+            conn.set_tunnel(parts.hostname, parts.port or 443)
+            return conn, path
+        return http.client.HTTPConnection(proxy_netloc, timeout=timeout), url
+    conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    return conn_cls(parts.netloc, timeout=timeout), path
+
+
+_RPC_HEADERS = {"Content-Type": "application/json", "Connection": "keep-alive"}
+_post_lock = threading.Lock()
+
+
+def post_json(conn, path, payload):
+    # No retry on a dropped connection: session/new and session/prompt are
+    # not idempotent, so a resend could create a second session or prompt.
+    data = _dumps(payload)
+    with _post_lock:
+        try:
+            conn.request("POST", path, body=data, headers=_RPC_HEADERS)
+            resp = conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            raise SystemExit(f"rpc request failed: {exc!r}") from None
+    if resp.status >= 400:
+        raise SystemExit(f"rpc request failed: HTTP {resp.status} {resp.reason}")
+
+
+def parse_sse_event(event):
+    data_lines = []
+    for line in event.split(b"\n"):
+        if line.startswith(b"data:"):
+            data_lines.append(line[len(b"data:") :].strip())
+    return b"\n".join(data_lines).strip()
 
 
 def sse_reader(url, out_queue, ready_event, stop_event):
-    req = urllib.request.Request(url, headers={"Accept": "text/event-stream"})
-    with urllib.request.urlopen(req, timeout=10) as resp:
+    """Push SSE messages onto *out_queue*; the exception that ended the stream goes last."""
+    error = ConnectionError("SSE stream closed")
+    try:
+        conn, path = open_connection(url)
+        try:
+            conn.request("GET", path, headers={"Accept": "text/event-stream"})
+            resp = conn.getresponse()
+            if resp.status != 200:
+                raise ConnectionError(f"SSE request failed: HTTP {resp.status} {resp.reason}")
+            # Events can be minutes apart while a prompt runs; read_response
+            # bounds the wait, so the stream itself must not time out.
+            conn.sock.settimeout(None)
+            ready_event.set()
+            buf = bytearray()
+            while not stop_event.is_set():
+                chunk = resp.read1(65536)
+                if not chunk:
+                    break
+                buf += chunk
+                if b"\r" in buf:
+                    buf = bytearray(buf.replace(b"\r\n", b"\n"))
+                while True:
+                    idx = buf.find(b"\n\n")
+                    if idx < 0:
+                        break
+                    event = buf[:idx]
+                    del buf[: idx + 2]
+                    payload = parse_sse_event(event)
+                    if not payload:
+                        continue
+                    try:
+                        out_queue.put(_loads(payload))
+                    except _JSONDecodeError:
+                        out_queue.put({"raw": payload.decode("utf-8", errors="replace")})
+        finally:
+            conn.close()
+    except (OSError, http.client.HTTPException) as exc:
+        error = exc
+    finally:
+        out_queue.put(error)
         ready_event.set()
-        data_lines = []
-        while not stop_event.is_set():
-            line = resp.readline()
-            if not line:
-                break
-            text = line.decode("utf-8").rstrip("\r\n")
-            if not text:
-                if data_lines:
-                    payload = "\n".join(data_lines).strip()
-                    data_lines = []
-                    if payload:
-                        try:
-                            out_queue.put(json.loads(payload))
-                        except json.JSONDecodeError:
-                            out_queue.put({"raw": payload})
-                continue
-            if text.startswith(":"):
-                continue
-            if text.startswith("data:"):
-                data_lines.append(text[len("data:") :].strip())
 
 
 def read_response(out_queue, want_id, timeout=10):
-    deadline = time.time() + timeout
-    while time.time() < deadline:
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
         try:
-            msg = out_queue.get(timeout=0.1)
+            msg = out_queue.get(timeout=remaining)
         except queue.Empty:
-            continue
+            break
+        if isinstance(msg, BaseException):
+            raise SystemExit(f"SSE stream ended while waiting for response id={want_id}: {msg}")
         if msg.get("id") == want_id:
             return msg
         print("<<", msg)
@@ -111,6 +189,9 @@ def main():
     )
     parser.add_argument("--cwd", default=None, help="Session working directory")
     parser.add_argument("--prompt", default="Hello ACP", help="Prompt text")
+    parser.add_argument(
+        "--timeout", type=float, default=300, help="Seconds to wait for the session/prompt response"
+    )
     args = parser.parse_args()
 
     addr = args.addr.strip() if args.addr else ""
@@ -118,8 +199,8 @@ def main():
         addr = resolve_default_addr()
     base_url = normalize_base_url(addr)
     client_id = uuid.uuid4().hex
-    sse_url = f"{base_url}/acp/sse?client_id={urllib.parse.quote(client_id)}"
-    rpc_url = f"{base_url}/acp/rpc?client_id={urllib.parse.quote(client_id)}"
+    sse_url = f"{base_url}/acp/sse?client_id={client_id}"
+    rpc_url = f"{base_url}/acp/rpc?client_id={client_id}"
 
     out_queue = queue.Queue()
     ready_event = threading.Event()
@@ -135,8 +216,17 @@ def main():
     if not ready_event.wait(timeout=5):
         raise SystemExit("failed to establish SSE connection")
 
+    conn, rpc_path = open_connection(rpc_url)
+    try:
+        return run_session(conn, rpc_path, out_queue, args)
+    finally:
+        conn.close()
+        stop_event.set()
+
+
+def run_session(conn, rpc_path, out_queue, args):
     request_id = 1
-    post_json(rpc_url, {"jsonrpc": "2.0", "id": request_id, "method": "initialize", "params": {"protocolVersion": 1}})
+    post_json(conn, rpc_path, {"jsonrpc": "2.0", "id": request_id, "method": "initialize", "params": {"protocolVersion": 1}})
     print("<<", read_response(out_queue, request_id))
 
     request_id += 1
@@ -144,7 +234,8 @@ def main():
     cwd_candidates = [os.path.abspath(args.cwd)] if args.cwd else resolve_default_cwds()
     for cwd in cwd_candidates:
         post_json(
-            rpc_url,
+            conn,
+            rpc_path,
             {
                 "jsonrpc": "2.0",
                 "id": request_id,
@@ -168,7 +259,8 @@ def main():
 
     request_id += 1
     post_json(
-        rpc_url,
+        conn,
+        rpc_path,
         {
             "jsonrpc": "2.0",
             "id": request_id,
@@ -176,14 +268,7 @@ def main():
             "params": {"sessionId": session_id, "prompt": [{"type": "text", "text": args.prompt}]},
         },
     )
-
-    while True:
-        msg = out_queue.get()
-        print("<<", msg)
-        if msg.get("id") == request_id:
-            break
-
-    stop_event.set()
+    print("<<", read_response(out_queue, request_id, timeout=args.timeout))
     return 0
 
 
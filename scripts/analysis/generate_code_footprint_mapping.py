@@ -4,15 +4,23 @@
 from __future__ import annotations
 
 import csv
+import functools
+import heapq
 import json
+import mmap
+import multiprocessing
 import os
+import re
 import subprocess
-import codecs
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from collections import defaultdict
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 CODE_EXTENSIONS = {
     ".go",
@@ -62,6 +70,9 @@ ASSET_EXTENSIONS = {
     ".mov",
 }
 
+# Assets that are never text; SVG is excluded because it is XML.
+BINARY_ASSET_EXTENSIONS = ASSET_EXTENSIONS - {".svg"}
+
 ROOT_CODE_FILENAMES = {
     "Makefile",
     "Dockerfile",
@@ -146,11 +157,54 @@ PREFIX_CAPABILITY: List[Tuple[str, str]] = [
     ("skills", "技能模板与流程资产"),
 ]
 
-PREFIX_CAPABILITY.sort(key=lambda item: len(item[0]), reverse=True)
-
-
-@dataclass
-class Row:
+PrefixTrie = Dict[Optional[str], Any]
+
+
+def build_prefix_trie(entries: Iterable[Tuple[str, str]]) -> PrefixTrie:
+    """Index prefixes by path component; the None key holds a node's capability."""
+    root: PrefixTrie = {}
+    for prefix, capability in entries:
+        node = root
+        for part in prefix.split("/"):
+            node = node.setdefault(part, {})
+        node[None] = capability
+    return root
+
+
+PREFIX_TRIE = build_prefix_trie(PREFIX_CAPABILITY)
+
+
+@functools.lru_cache(maxsize=None)
+def directory_prefix(directory: str) -> Tuple[Optional[PrefixTrie], Optional[str]]:
+    """Walk the trie over a directory once; node is None when the walk fell off."""
+    node = PREFIX_TRIE
+    capability = None
+    if not directory:
+        return node, capability
+    for part in directory.split("/"):
+        node = node.get(part)
+        if node is None:
+            return None, capability
+        capability = node.get(None, capability)
+    return node, capability
+
+
+def prefix_capability(path: str) -> Optional[str]:
+    """Return the capability of the longest mapped prefix of path, if any."""
+    directory, _, name = path.rpartition("/")
+    node, capability = directory_prefix(directory)
+    if node is None:
+        return capability
+    child = node.get(name)
+    if child is None:
+        # A prefix may name a file stem, e.g. "web/hooks/useSSE" covers useSSE.ts.
+        child = node.get(os.path.splitext(name)[0])
+    if child is not None:
+        capability = child.get(None, capability)
+    return capability
+
+
+class Row(NamedTuple):
     path: str
     bytes: int
     line_count: int
@@ -172,9 +226,80 @@ def run(cmd: List[str]) -> str:
     return subprocess.check_output(cmd, text=True).strip()
 
 
-def git_tracked_files(ref: str) -> List[str]:
-    out = run(["git", "ls-tree", "-r", "--name-only", ref])
-    files = [line for line in out.splitlines() if line.strip()]
+def git_tracked_files(ref: str) -> List[Tuple[str, Optional[int]]]:
+    """List (path, blob size) for every entry in ref.
+
+    Size is None for entries whose on-disk size git cannot vouch for
+    (symlinks, submodules); callers stat those instead.
+    """
+    out = subprocess.check_output(["git", "ls-tree", "-r", "-l", "-z", ref])
+    files: List[Tuple[str, Optional[int]]] = []
+    for entry in out.decode("utf-8", errors="surrogateescape").split("\0"):
+        if not entry:
+            continue
+        meta, _, path = entry.partition("\t")
+        if not path.strip():
+            continue
+        mode, obj_type, _, size_field = meta.split(None, 3)
+        size: Optional[int] = None
+        if obj_type == "blob" and mode != "120000" and size_field.isdigit():
+            size = int(size_field)
+        files.append((path, size))
+    files.sort()
+    return files
+
+
+# Bytes that occur in text: common control characters, ESC, printable ASCII and
+# everything >= 0x80 so UTF-8 (e.g. Chinese docs) is never mistaken for binary.
+_TEXT_BYTES = bytes(range(7, 14)) + b"\x1b" + bytes(range(32, 256))
+
+
+def scan_tree(repo_root: str, rel_dir: str) -> List[Tuple[str, Optional[int]]]:
+    """Iteratively scandir one subtree, returning repo-relative (path, size) pairs."""
+    found: List[Tuple[str, Optional[int]]] = []
+    stack = [rel_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(os.path.join(repo_root, current)))
+        except OSError:
+            continue
+        for entry in entries:
+            rel = f"{current}/{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(rel)
+                elif entry.is_symlink():
+                    found.append((rel, None))
+                else:
+                    found.append((rel, entry.stat(follow_symlinks=False).st_size))
+            except OSError:
+                found.append((rel, None))
+    return found
+
+
+def fs_tracked_files(repo_root: Path) -> List[Tuple[str, Optional[int]]]:
+    """Walk the working copy with os.scandir instead of asking git.
+
+    No .gitignore handling: everything except .git/ is listed. Top-level
+    directories are scanned in parallel. macOS getattrlistbulk would batch
+    the per-entry metadata further; not implemented.
+    """
+    root = str(repo_root)
+    files: List[Tuple[str, Optional[int]]] = []
+    subdirs: List[str] = []
+    for entry in os.scandir(root):
+        if entry.name == ".git":
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.name)
+        elif entry.is_symlink():
+            files.append((entry.name, None))
+        else:
+            files.append((entry.name, entry.stat(follow_symlinks=False).st_size))
+    with ThreadPoolExecutor(max_workers=stats_workers()) as executor:
+        for found in executor.map(lambda d: scan_tree(root, d), subdirs):
+            files.extend(found)
     files.sort()
     return files
 
@@ -185,52 +310,84 @@ def is_probably_binary(data: bytes) -> bool:
     sample = data[:8192]
     if b"\x00" in sample:
         return True
-    try:
-        decoder = codecs.getincrementaldecoder("utf-8")()
-        decoder.decode(sample, final=False)
-        return False
-    except UnicodeDecodeError:
-        return True
+    # Binary if more than a quarter of the sample is non-text control bytes.
+    return len(sample.translate(None, _TEXT_BYTES)) * 4 > len(sample)
+
+
+READ_CHUNK_SIZE = 1 << 20
+# Files above this size are counted through mmap; below it, setup cost dominates.
+MMAP_THRESHOLD = 256 * 1024
+# mmap has no count(); scan it in large slices so most files take one pass.
+MMAP_WINDOW = 8 << 20
+
+
+def count_newlines_mmap(fd: int, size: int) -> int:
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return sum(mm[offset : offset + MMAP_WINDOW].count(b"\n") for offset in range(0, size, MMAP_WINDOW))
 
 
 def file_stats(path: Path) -> Tuple[int, bool]:
+    if path.suffix.lower() in BINARY_ASSET_EXTENSIONS:
+        return 0, True
     try:
-        with path.open("rb") as f:
-            sample = f.read(8192)
-            if not sample:
-                return 0, False
-            binary = is_probably_binary(sample)
-            if binary:
-                return 0, True
-            line_count = sample.count(b"\n")
-            while True:
-                chunk = f.read(65536)
-                if not chunk:
-                    break
-                line_count += chunk.count(b"\n")
-            return line_count, False
+        fd = os.open(path, os.O_RDONLY)
     except OSError:
         return 0, False
+    try:
+        sample = os.pread(fd, 8192, 0)
+        if not sample:
+            return 0, False
+        if is_probably_binary(sample):
+            return 0, True
+        size = os.fstat(fd).st_size
+        if size > MMAP_THRESHOLD:
+            return count_newlines_mmap(fd, size), False
+        line_count = 0
+        chunk = os.read(fd, READ_CHUNK_SIZE)
+        while chunk:
+            line_count += chunk.count(b"\n")
+            chunk = os.read(fd, READ_CHUNK_SIZE)
+        return line_count, False
+    except (OSError, ValueError):
+        return 0, False
+    finally:
+        os.close(fd)
 
 
-def is_test_path(path: str) -> bool:
-    name = os.path.basename(path)
-    lower = path.lower()
-    return (
-        name.endswith("_test.go")
-        or name.endswith(".test.ts")
-        or name.endswith(".test.tsx")
-        or name.endswith(".spec.ts")
-        or name.endswith(".spec.tsx")
-        or "/__tests__/" in lower
-        or "/tests/" in lower
-        or lower.startswith("tests/")
-        or lower.startswith("web/e2e/")
-    )
+def stats_workers() -> int:
+    """Thread count for file_stats: I/O bound, but bounded by the fd limit."""
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    try:
+        import resource
+    except ImportError:
+        return workers
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY:
+        # Each worker holds at most one open file; leave half the limit spare.
+        workers = min(workers, max(1, soft // 2))
+    return workers
+
+
+TEST_SUFFIXES = ("_test.go", ".test.ts", ".test.tsx", ".spec.ts", ".spec.tsx")
+TEST_DIR_MARKERS = ("/__tests__/", "/tests/")
+TEST_ROOT_PREFIXES = ("tests/", "web/e2e/")
+
+
+def is_test_path(path: str, lower: str) -> bool:
+    # Suffixes contain no "/", so matching the full path equals matching the basename.
+    if path.endswith(TEST_SUFFIXES):
+        return True
+    return lower.startswith(TEST_ROOT_PREFIXES) or any(marker in lower for marker in TEST_DIR_MARKERS)
 
 
 def detect_extension(path: str) -> str:
-    name = os.path.basename(path)
+    return extension_for_name(os.path.basename(path))
+
+
+@functools.lru_cache(maxsize=None)
+def extension_for_name(name: str) -> str:
     ext = Path(name).suffix.lower()
     if ext:
         return ext
@@ -239,10 +396,9 @@ def detect_extension(path: str) -> str:
     return ""
 
 
-def detect_file_kind(path: str, ext: str, is_test: bool) -> str:
+def detect_file_kind(path: str, lower: str, ext: str, is_test: bool) -> str:
     if is_test:
         return "test"
-    lower = path.lower()
     if ext in ASSET_EXTENSIONS:
         return "asset"
     if lower.startswith("docs/") or ext in DOC_EXTENSIONS:
@@ -258,7 +414,9 @@ def detect_file_kind(path: str, ext: str, is_test: bool) -> str:
     return "other"
 
 
-def detect_layer(path: str) -> str:
+@functools.lru_cache(maxsize=None)
+def detect_layer(directory: str) -> str:
+    path = directory + "/"
     mapping = [
         ("internal/domain/", "domain"),
         ("internal/app/", "app"),
@@ -281,14 +439,9 @@ def detect_layer(path: str) -> str:
     return "root"
 
 
-def module_levels(path: str) -> Tuple[str, str, str]:
-    raw_parts = path.split("/")
-    if len(raw_parts) == 1:
-        return (raw_parts[0], raw_parts[0], raw_parts[0])
-
-    parts = raw_parts[:-1]
-    if not parts:
-        return (raw_parts[0], raw_parts[0], raw_parts[0])
+@functools.lru_cache(maxsize=None)
+def module_levels(directory: str) -> Tuple[str, str, str]:
+    parts = directory.split("/")
 
     def join_prefix(n: int) -> str:
         return "/".join(parts[: min(n, len(parts))])
@@ -296,8 +449,7 @@ def module_levels(path: str) -> Tuple[str, str, str]:
     return (join_prefix(2), join_prefix(3), join_prefix(4))
 
 
-def generated_hint(path: str) -> bool:
-    lower = path.lower()
+def generated_hint(lower: str) -> bool:
     return (
         "/generated/" in lower
         or lower.endswith(".pb.go")
@@ -307,32 +459,49 @@ def generated_hint(path: str) -> bool:
     )
 
 
-def capability_for(path: str, layer: str, module_l2: str, file_kind: str, is_test: bool) -> Tuple[str, str]:
-    for prefix, capability in PREFIX_CAPABILITY:
-        if path.startswith(prefix):
-            return capability, "prefix"
-
-    lower = path.lower()
-    keywords = [
-        ("scheduler", "调度与提醒策略实现"),
-        ("reminder", "提醒能力实现"),
-        ("memory", "记忆读写与检索能力"),
-        ("lark", "Lark 平台集成能力"),
-        ("oauth", "OAuth 鉴权流程"),
-        ("observability", "可观测性能力"),
-        ("metrics", "指标采集与监控"),
-        ("trace", "链路追踪能力"),
-        ("tool", "工具调用与策略控制"),
-        ("workflow", "工作流编排能力"),
-        ("session", "会话状态管理"),
-        ("api", "API 交付接口"),
-        ("router", "路由与请求分发"),
-        ("render", "输出渲染与格式化"),
-        ("eval", "评测流程实现"),
-    ]
-    for key, capability in keywords:
-        if key in lower:
-            return capability, "keyword"
+# Fallback keywords in priority order: the earliest listed keyword found in a path wins.
+CAPABILITY_KEYWORDS: List[Tuple[str, str]] = [
+    ("scheduler", "调度与提醒策略实现"),
+    ("reminder", "提醒能力实现"),
+    ("memory", "记忆读写与检索能力"),
+    ("lark", "Lark 平台集成能力"),
+    ("oauth", "OAuth 鉴权流程"),
+    ("observability", "可观测性能力"),
+    ("metrics", "指标采集与监控"),
+    ("trace", "链路追踪能力"),
+    ("tool", "工具调用与策略控制"),
+    ("workflow", "工作流编排能力"),
+    ("session", "会话状态管理"),
+    ("api", "API 交付接口"),
+    ("router", "路由与请求分发"),
+    ("render", "输出渲染与格式化"),
+    ("eval", "评测流程实现"),
+]
+
+_KEYWORD_PRIORITY = {key: idx for idx, (key, _) in enumerate(CAPABILITY_KEYWORDS)}
+# Zero-width lookahead so overlapping hits are all reported in a single scan.
+_KEYWORD_RE = re.compile("(?=(" + "|".join(re.escape(key) for key, _ in CAPABILITY_KEYWORDS) + "))")
+
+
+def keyword_capability(lower: str) -> Optional[str]:
+    best = None
+    for match in _KEYWORD_RE.finditer(lower):
+        idx = _KEYWORD_PRIORITY[match.group(1)]
+        if best is None or idx < best:
+            best = idx
+    if best is None:
+        return None
+    return CAPABILITY_KEYWORDS[best][1]
+
+
+def capability_for(path: str, lower: str, layer: str, module_l2: str, file_kind: str, is_test: bool) -> Tuple[str, str]:
+    capability = prefix_capability(path)
+    if capability is not None:
+        return capability, "prefix"
+
+    capability = keyword_capability(lower)
+    if capability is not None:
+        return capability, "keyword"
 
     if is_test or file_kind == "test":
         return "测试与回归保障", "fallback"
@@ -346,273 +515,360 @@ def capability_for(path: str, layer: str, module_l2: str, file_kind: str, is_tes
     return f"{module_l2} 子模块实现", "fallback"
 
 
-def build_rows(repo_root: Path, files: Iterable[str]) -> List[Row]:
-    rows: List[Row] = []
-    for rel in files:
-        abs_path = repo_root / rel
+def build_row(repo_root: Path, rel: str, size: Optional[int], stats: Tuple[int, bool]) -> Row:
+    line_count, is_binary = stats
+    if size is None:
         try:
-            size = abs_path.stat().st_size
+            size = (repo_root / rel).stat().st_size
         except OSError:
             size = 0
-        line_count, is_binary = file_stats(abs_path)
-        ext = detect_extension(rel)
-        is_test = is_test_path(rel)
-        file_kind = detect_file_kind(rel, ext, is_test)
-        is_code = file_kind in {"code", "automation", "ci"} or (
-            ext in CODE_EXTENSIONS or os.path.basename(rel) in ROOT_CODE_FILENAMES
-        )
-        layer = detect_layer(rel)
-        module_l1, module_l2, module_l3 = module_levels(rel)
-        capability, source = capability_for(rel, layer, module_l2, file_kind, is_test)
-        rows.append(
-            Row(
-                path=rel,
-                bytes=size,
-                line_count=line_count,
-                is_binary=is_binary,
-                extension=ext,
-                file_kind=file_kind,
-                is_code=is_code,
-                is_test=is_test,
-                is_generated=generated_hint(rel),
-                logical_layer=layer,
-                module_l1=module_l1,
-                module_l2=module_l2,
-                module_l3=module_l3,
-                capability=capability,
-                capability_source=source,
-            )
-        )
-    return rows
-
-
-def write_repo_catalog(path: Path, rows: List[Row]) -> None:
-    with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            [
-                "path",
-                "bytes",
-                "line_count",
-                "is_binary",
-                "extension",
-                "file_kind",
-                "is_code",
-                "is_test",
-                "is_generated",
-                "logical_layer",
-                "module_l1",
-                "module_l2",
-                "module_l3",
-                "capability",
-                "capability_source",
-            ]
-        )
-        for r in rows:
-            writer.writerow(
-                [
-                    r.path,
-                    r.bytes,
-                    r.line_count,
-                    str(r.is_binary).lower(),
-                    r.extension,
-                    r.file_kind,
-                    str(r.is_code).lower(),
-                    str(r.is_test).lower(),
-                    str(r.is_generated).lower(),
-                    r.logical_layer,
-                    r.module_l1,
-                    r.module_l2,
-                    r.module_l3,
-                    r.capability,
-                    r.capability_source,
-                ]
-            )
+    lower = rel.lower()
+    ext = detect_extension(rel)
+    is_test = is_test_path(rel, lower)
+    file_kind = detect_file_kind(rel, lower, ext, is_test)
+    is_code = file_kind in {"code", "automation", "ci"} or (
+        ext in CODE_EXTENSIONS or os.path.basename(rel) in ROOT_CODE_FILENAMES
+    )
+    directory = rel.rpartition("/")[0]
+    layer = detect_layer(directory)
+    if directory:
+        module_l1, module_l2, module_l3 = module_levels(directory)
+    else:
+        module_l1 = module_l2 = module_l3 = rel
+    capability, source = capability_for(rel, lower, layer, module_l2, file_kind, is_test)
+    return Row(
+        path=rel,
+        bytes=size,
+        line_count=line_count,
+        is_binary=is_binary,
+        extension=ext,
+        file_kind=file_kind,
+        is_code=is_code,
+        is_test=is_test,
+        is_generated=generated_hint(lower),
+        logical_layer=layer,
+        module_l1=module_l1,
+        module_l2=module_l2,
+        module_l3=module_l3,
+        capability=capability,
+        capability_source=source,
+    )
 
 
-def write_code_mapping(path: Path, rows: List[Row]) -> None:
-    code_rows = [r for r in rows if r.is_code]
-    with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            [
-                "path",
-                "line_count",
-                "bytes",
-                "is_binary",
-                "logical_layer",
-                "module_l1",
-                "module_l2",
-                "module_l3",
-                "is_test",
-                "is_generated",
-                "capability",
-                "capability_source",
-            ]
-        )
-        for r in code_rows:
-            writer.writerow(
-                [
-                    r.path,
-                    r.line_count,
-                    r.bytes,
-                    str(r.is_binary).lower(),
-                    r.logical_layer,
-                    r.module_l1,
-                    r.module_l2,
-                    r.module_l3,
-                    str(r.is_test).lower(),
-                    str(r.is_generated).lower(),
-                    r.capability,
-                    r.capability_source,
-                ]
+def process_file(repo_root: Path, item: Tuple[str, Optional[int]]) -> Row:
+    """Process-pool entry point: stats and classification for one file."""
+    rel, size = item
+    return build_row(repo_root, rel, size, file_stats(repo_root / rel))
+
+
+# Below this many files, process start-up and IPC cost more than they save.
+PROCESS_POOL_MIN_FILES = 2000
+PROCESS_POOL_CHUNKSIZE = 256
+
+
+def iter_rows(repo_root: Path, files: Iterable[Tuple[str, Optional[int]]]) -> Iterator[Row]:
+    files = list(files)
+    cpus = os.cpu_count() or 1
+    if len(files) >= PROCESS_POOL_MIN_FILES and cpus > 1:
+        with multiprocessing.Pool(processes=cpus) as pool:
+            yield from pool.imap(
+                functools.partial(process_file, repo_root),
+                files,
+                chunksize=PROCESS_POOL_CHUNKSIZE,
             )
+        return
+
+    abs_paths = [repo_root / rel for rel, _ in files]
+    with ThreadPoolExecutor(max_workers=stats_workers()) as executor:
+        for (rel, size), stats in zip(files, executor.map(file_stats, abs_paths)):
+            yield build_row(repo_root, rel, size, stats)
+
+
+CATALOG_HEADER = [
+    "path",
+    "bytes",
+    "line_count",
+    "is_binary",
+    "extension",
+    "file_kind",
+    "is_code",
+    "is_test",
+    "is_generated",
+    "logical_layer",
+    "module_l1",
+    "module_l2",
+    "module_l3",
+    "capability",
+    "capability_source",
+]
 
+CODE_MAPPING_HEADER = [
+    "path",
+    "line_count",
+    "bytes",
+    "is_binary",
+    "logical_layer",
+    "module_l1",
+    "module_l2",
+    "module_l3",
+    "is_test",
+    "is_generated",
+    "capability",
+    "capability_source",
+]
 
-def write_module_summary(path: Path, rows: List[Row]) -> None:
-    buckets = defaultdict(
-        lambda: {
-            "layer": "",
-            "module_l1": "",
-            "module_l2": "",
-            "module_l3": "",
-            "files": 0,
-            "code_files": 0,
-            "test_files": 0,
-            "lines": 0,
-            "code_lines": 0,
-            "capability_lines": defaultdict(int),
-        }
-    )
-    for r in rows:
-        b = buckets[r.module_l2]
-        b["layer"] = r.logical_layer
-        b["module_l1"] = r.module_l1
-        b["module_l2"] = r.module_l2
+MODULE_SUMMARY_HEADER = [
+    "logical_layer",
+    "module_l1",
+    "module_l2",
+    "module_l3",
+    "file_count",
+    "code_file_count",
+    "test_file_count",
+    "total_lines",
+    "code_lines",
+    "dominant_capability",
+    "dominant_capability_line_share",
+]
+
+
+def catalog_record(r: Row) -> list:
+    return [
+        r.path,
+        r.bytes,
+        r.line_count,
+        str(r.is_binary).lower(),
+        r.extension,
+        r.file_kind,
+        str(r.is_code).lower(),
+        str(r.is_test).lower(),
+        str(r.is_generated).lower(),
+        r.logical_layer,
+        r.module_l1,
+        r.module_l2,
+        r.module_l3,
+        r.capability,
+        r.capability_source,
+    ]
+
+
+def code_mapping_record(r: Row) -> list:
+    return [
+        r.path,
+        r.line_count,
+        r.bytes,
+        str(r.is_binary).lower(),
+        r.logical_layer,
+        r.module_l1,
+        r.module_l2,
+        r.module_l3,
+        str(r.is_test).lower(),
+        str(r.is_generated).lower(),
+        r.capability,
+        r.capability_source,
+    ]
+
+
+class ModuleSummary:
+    """Per-module_l2 file/line totals and dominant capability."""
+
+    def __init__(self) -> None:
+        self.buckets: Dict[str, dict] = {}
+        # Kept apart from buckets so the hot path skips a nested lookup.
+        self.capability_lines: Dict[str, Dict[str, int]] = {}
+
+    def add(self, r: Row) -> None:
+        key = r.module_l2
+        line_count = r.line_count
+        b = self.buckets.get(key)
+        if b is None:
+            # layer and module_l1 are fixed by module_l2; module_l3 still tracks the latest file.
+            b = self.buckets[key] = {
+                "layer": r.logical_layer,
+                "module_l1": r.module_l1,
+                "module_l3": "",
+                "files": 0,
+                "code_files": 0,
+                "test_files": 0,
+                "lines": 0,
+                "code_lines": 0,
+            }
+            self.capability_lines[key] = {}
         b["module_l3"] = r.module_l3
         b["files"] += 1
-        b["lines"] += r.line_count
+        b["lines"] += line_count
         if r.is_code:
             b["code_files"] += 1
-            b["code_lines"] += r.line_count
-            b["capability_lines"][r.capability] += r.line_count
+            b["code_lines"] += line_count
+            capability_lines = self.capability_lines[key]
+            capability_lines[r.capability] = capability_lines.get(r.capability, 0) + line_count
         if r.is_test:
             b["test_files"] += 1
 
-    rows_out = []
-    for module_l2, b in buckets.items():
-        capability_lines = b["capability_lines"]
-        if capability_lines:
-            dominant_capability, dominant_lines = max(capability_lines.items(), key=lambda kv: kv[1])
-        else:
-            dominant_capability, dominant_lines = ("", 0)
-        share = 0.0
-        if b["code_lines"] > 0:
-            share = dominant_lines / b["code_lines"]
-        rows_out.append(
-            [
-                b["layer"],
-                b["module_l1"],
-                module_l2,
-                b["module_l3"],
-                b["files"],
-                b["code_files"],
-                b["test_files"],
-                b["lines"],
-                b["code_lines"],
-                dominant_capability,
-                f"{share:.4f}",
-            ]
-        )
-    rows_out.sort(key=lambda x: int(x[8]), reverse=True)
-
-    with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            [
-                "logical_layer",
-                "module_l1",
-                "module_l2",
-                "module_l3",
-                "file_count",
-                "code_file_count",
-                "test_file_count",
-                "total_lines",
-                "code_lines",
-                "dominant_capability",
-                "dominant_capability_line_share",
-            ]
-        )
-        for row in rows_out:
-            writer.writerow(row)
-
-
-def build_summary(rows: List[Row]) -> dict:
-    total_files = len(rows)
-    total_lines = sum(r.line_count for r in rows)
-    total_bytes = sum(r.bytes for r in rows)
-    binary_files = sum(1 for r in rows if r.is_binary)
-
-    code_rows = [r for r in rows if r.is_code]
-    code_files = len(code_rows)
-    code_lines = sum(r.line_count for r in code_rows)
-
-    by_layer = defaultdict(lambda: {"files": 0, "lines": 0, "code_files": 0, "code_lines": 0, "bytes": 0})
-    by_module_l2 = defaultdict(
-        lambda: {
-            "layer": "",
-            "files": 0,
-            "lines": 0,
-            "code_files": 0,
-            "code_lines": 0,
-            "bytes": 0,
-        }
-    )
-    for r in rows:
-        layer_bucket = by_layer[r.logical_layer]
-        layer_bucket["files"] += 1
-        layer_bucket["lines"] += r.line_count
-        layer_bucket["bytes"] += r.bytes
+    def write(self, path: Path) -> None:
+        rows_out = []
+        for module_l2, b in self.buckets.items():
+            capability_lines = self.capability_lines[module_l2]
+            if capability_lines:
+                dominant_capability, dominant_lines = max(capability_lines.items(), key=lambda kv: kv[1])
+            else:
+                dominant_capability, dominant_lines = ("", 0)
+            share = 0.0
+            if b["code_lines"] > 0:
+                share = dominant_lines / b["code_lines"]
+            rows_out.append(
+                [
+                    b["layer"],
+                    b["module_l1"],
+                    module_l2,
+                    b["module_l3"],
+                    b["files"],
+                    b["code_files"],
+                    b["test_files"],
+                    b["lines"],
+                    b["code_lines"],
+                    dominant_capability,
+                    f"{share:.4f}",
+                ]
+            )
+        rows_out.sort(key=lambda x: int(x[8]), reverse=True)
+
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(MODULE_SUMMARY_HEADER)
+            writer.writerows(rows_out)
+
+
+TOP_CODE_FILES = 30
+
+
+class FootprintSummary:
+    """Repository totals, per-layer/per-module breakdowns and largest code files."""
+
+    def __init__(self, coverage_basis: str) -> None:
+        self.coverage_basis = coverage_basis
+        self.total_files = 0
+        self.total_lines = 0
+        self.total_bytes = 0
+        self.binary_files = 0
+        self.code_files = 0
+        self.code_lines = 0
+        self.by_layer: Dict[str, dict] = {}
+        self.by_module_l2: Dict[str, dict] = {}
+        # Min-heap of (line_count, -seq, row) holding the largest non-test code files.
+        self.top_code_heap: List[Tuple[int, int, Row]] = []
+
+    def add(self, r: Row) -> None:
+        self.total_files += 1
+        self.total_lines += r.line_count
+        self.total_bytes += r.bytes
+        if r.is_binary:
+            self.binary_files += 1
         if r.is_code:
+            self.code_files += 1
+            self.code_lines += r.line_count
+            if not r.is_test:
+                # -seq keeps earlier files ahead on ties, matching a stable sort.
+                item = (r.line_count, -self.total_files, r)
+                if len(self.top_code_heap) < TOP_CODE_FILES:
+                    heapq.heappush(self.top_code_heap, item)
+                elif item > self.top_code_heap[0]:
+                    heapq.heapreplace(self.top_code_heap, item)
+
+        line_count = r.line_count
+        size = r.bytes
+        is_code = r.is_code
+
+        layer_bucket = self.by_layer.get(r.logical_layer)
+        if layer_bucket is None:
+            layer_bucket = self.by_layer[r.logical_layer] = {
+                "files": 0,
+                "lines": 0,
+                "code_files": 0,
+                "code_lines": 0,
+                "bytes": 0,
+            }
+        layer_bucket["files"] += 1
+        layer_bucket["lines"] += line_count
+        layer_bucket["bytes"] += size
+        if is_code:
             layer_bucket["code_files"] += 1
-            layer_bucket["code_lines"] += r.line_count
-
-        module_bucket = by_module_l2[r.module_l2]
-        module_bucket["layer"] = r.logical_layer
+            layer_bucket["code_lines"] += line_count
+
+        module_bucket = self.by_module_l2.get(r.module_l2)
+        if module_bucket is None:
+            module_bucket = self.by_module_l2[r.module_l2] = {
+                "layer": r.logical_layer,
+                "files": 0,
+                "lines": 0,
+                "code_files": 0,
+                "code_lines": 0,
+                "bytes": 0,
+            }
         module_bucket["files"] += 1
-        module_bucket["lines"] += r.line_count
-        module_bucket["bytes"] += r.bytes
-        if r.is_code:
+        module_bucket["lines"] += line_count
+        module_bucket["bytes"] += size
+        if is_code:
             module_bucket["code_files"] += 1
-            module_bucket["code_lines"] += r.line_count
-
-    top_code_files = sorted(
-        [r for r in code_rows if not r.is_test],
-        key=lambda r: r.line_count,
-        reverse=True,
-    )[:30]
-
-    return {
-        "total_files": total_files,
-        "total_lines": total_lines,
-        "total_bytes": total_bytes,
-        "binary_files": binary_files,
-        "code_files": code_files,
-        "code_lines": code_lines,
-        "coverage_basis": "git ls-files",
-        "by_layer": dict(sorted(by_layer.items(), key=lambda kv: kv[1]["lines"], reverse=True)),
-        "by_module_l2": dict(sorted(by_module_l2.items(), key=lambda kv: kv[1]["lines"], reverse=True)),
-        "top_code_files": [
-            {
-                "path": r.path,
-                "line_count": r.line_count,
-                "logical_layer": r.logical_layer,
-                "module_l2": r.module_l2,
-                "capability": r.capability,
-            }
-            for r in top_code_files
-        ],
-    }
+            module_bucket["code_lines"] += line_count
+
+    def to_dict(self) -> dict:
+        top_code_files = [item[2] for item in sorted(self.top_code_heap, reverse=True)]
+
+        return {
+            "total_files": self.total_files,
+            "total_lines": self.total_lines,
+            "total_bytes": self.total_bytes,
+            "binary_files": self.binary_files,
+            "code_files": self.code_files,
+            "code_lines": self.code_lines,
+            "coverage_basis": self.coverage_basis,
+            "by_layer": dict(sorted(self.by_layer.items(), key=lambda kv: kv[1]["lines"], reverse=True)),
+            "by_module_l2": dict(sorted(self.by_module_l2.items(), key=lambda kv: kv[1]["lines"], reverse=True)),
+            "top_code_files": [
+                {
+                    "path": r.path,
+                    "line_count": r.line_count,
+                    "logical_layer": r.logical_layer,
+                    "module_l2": r.module_l2,
+                    "capability": r.capability,
+                }
+                for r in top_code_files
+            ],
+        }
+
+
+def write_outputs(
+    rows: Iterable[Row],
+    catalog_path: Path,
+    code_mapping_path: Path,
+    module_summary_path: Path,
+    coverage_basis: str,
+) -> dict:
+    """Stream rows into both CSVs and the aggregates in a single pass."""
+    modules = ModuleSummary()
+    summary = FootprintSummary(coverage_basis)
+    with catalog_path.open("w", newline="", encoding="utf-8") as catalog_f, code_mapping_path.open(
+        "w", newline="", encoding="utf-8"
+    ) as mapping_f:
+        catalog = csv.writer(catalog_f)
+        catalog.writerow(CATALOG_HEADER)
+        mapping = csv.writer(mapping_f)
+        mapping.writerow(CODE_MAPPING_HEADER)
+        for r in rows:
+            catalog.writerow(catalog_record(r))
+            if r.is_code:
+                mapping.writerow(code_mapping_record(r))
+            modules.add(r)
+            summary.add(r)
+    modules.write(module_summary_path)
+    return summary.to_dict()
+
+
+def dump_summary(summary: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(summary, ensure_ascii=False, indent=2).encode("utf-8")
 
 
 def main() -> None:
@@ -628,14 +884,16 @@ def main() -> None:
     summary_path = out_dir / f"{today_prefix}-code-footprint-summary.json"
 
     source_ref = os.environ.get("FOOTPRINT_SOURCE_REF", "HEAD")
-    files = git_tracked_files(source_ref)
-    rows = build_rows(repo_root, files)
-
-    write_repo_catalog(catalog_path, rows)
-    write_code_mapping(code_mapping_path, rows)
-    write_module_summary(module_summary_path, rows)
-    summary = build_summary(rows)
-    summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    use_fs = os.environ.get("FOOTPRINT_USE_FS") == "1" or not (repo_root / ".git").exists()
+    if use_fs:
+        files = fs_tracked_files(repo_root)
+        coverage_basis = "filesystem scan"
+    else:
+        files = git_tracked_files(source_ref)
+        coverage_basis = "git ls-files"
+    rows = iter_rows(repo_root, files)
+    summary = write_outputs(rows, catalog_path, code_mapping_path, module_summary_path, coverage_basis)
+    summary_path.write_bytes(dump_summary(summary))
 
     print(f"generated: {catalog_path}")
     print(f"generated: {code_mapping_path}")
@@ -5,21 +5,167 @@ Usage:
     tavily_search.py "query"
     tavily_search.py "query" --max-results 10 --depth advanced
     tavily_search.py --json '{"query":"...", "max_results":5}'
+    printf 'q1\nq2\n' | tavily_search.py --batch
 
 Output: JSON to stdout.
 Falls back to DuckDuckGo HTML scraping when TAVILY_API_KEY is unset.
+Set TAVILY_CACHE_TTL=<seconds> to reuse identical results within a process.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import copy
+import html
+import http.client
 import json
 import os
+import re
 import sys
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from html.parser import HTMLParser
+from collections import OrderedDict
+
+
+# ── HTTP keep-alive pool ─────────────────────────────────────────
+
+# One idle connection per (scheme, host) so repeated searches in one process
+# reuse the TCP/TLS session to api.tavily.com and html.duckduckgo.com.
+_CONNECTIONS: dict[tuple[str, str], http.client.HTTPConnection] = {}
+_CONNECTIONS_LOCK = threading.Lock()
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 3
+
+
+def _uses_proxy(parts: urllib.parse.SplitResult) -> bool:
+    """Whether urllib would route this URL through a configured proxy."""
+    if parts.scheme not in urllib.request.getproxies():
+        return False
+    return not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+def _urlopen_request(
+    method: str, url: str, *, data: bytes | None, headers: dict[str, str] | None, timeout: float
+) -> bytes:
+    req = urllib.request.Request(url, data=data, headers=headers or {}, method=method)
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read()
+
+
+def _http_request(
+    method: str,
+    url: str,
+    *,
+    data: bytes | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float = 30,
+) -> bytes:
+    """Send a request over a pooled keep-alive connection and return the body.
+
+    Network failures and HTTP errors raise urllib.error.URLError (HTTPError for
+    status >= 400), mirroring urllib.request.urlopen. URLs that a configured
+    HTTP(S)_PROXY applies to (per no_proxy) go through urlopen itself.
+    """
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if _uses_proxy(parts):
+            return _urlopen_request(method, url, data=data, headers=headers, timeout=timeout)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        with _CONNECTIONS_LOCK:
+            conn = _CONNECTIONS.pop(key, None)
+        reused = conn is not None
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = conn_cls(parts.netloc, timeout=timeout)
+        else:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+
+        try:
+            try:
+                conn.request(method, path, body=data, headers=headers or {})
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The pooled connection went stale while idle; retry on a fresh one.
+                conn.close()
+                conn.request(method, path, body=data, headers=headers or {})
+                resp = conn.getresponse()
+            body = resp.read()
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            raise urllib.error.URLError(exc) from exc
+
+        if resp.will_close:
+            conn.close()
+        else:
+            with _CONNECTIONS_LOCK:
+                stale = _CONNECTIONS.pop(key, None)
+                _CONNECTIONS[key] = conn
+            if stale is not None:
+                stale.close()
+
+        location = resp.getheader("Location")
+        if resp.status in _REDIRECT_CODES and location:
+            url = urllib.parse.urljoin(url, location)
+            if resp.status == 303 or (resp.status in (301, 302) and method == "POST"):
+                method, data = "GET", None
+            continue
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return body
+
+    raise urllib.error.URLError(f"too many redirects: {url}")
+
+
+# ── Result cache ─────────────────────────────────────────────────
+
+# LRU of (query, max_results, search_depth) -> (stored_at, result). Disabled
+# unless TAVILY_CACHE_TTL (seconds) or expire_after enables it, so repeated
+# one-shot CLI runs and tests always see live answers.
+_CACHE: OrderedDict[tuple[str, int, str], tuple[float, dict]] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_CACHE_MAXSIZE = 128
+
+
+def _cache_ttl() -> float:
+    try:
+        return float(os.environ.get("TAVILY_CACHE_TTL", "0"))
+    except ValueError:
+        return 0.0
+
+
+def _cache_get(key: tuple[str, int, str], ttl: float) -> dict | None:
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] >= ttl:
+            del _CACHE[key]
+            return None
+        _CACHE.move_to_end(key)
+        return copy.deepcopy(hit[1])
+
+
+def _cache_put(key: tuple[str, int, str], result: dict) -> None:
+    with _CACHE_LOCK:
+        _CACHE[key] = (time.monotonic(), copy.deepcopy(result))
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _CACHE_MAXSIZE:
+            _CACHE.popitem(last=False)
+
+
+# ── Tavily ───────────────────────────────────────────────────────
 
 
 def tavily_search(
@@ -28,8 +174,29 @@ def tavily_search(
     max_results: int = 5,
     search_depth: str = "basic",
     api_key: str | None = None,
+    expire_after: float | None = None,
 ) -> dict:
-    """Call Tavily API and return structured results."""
+    """Call Tavily API and return structured results.
+
+    ``expire_after`` (seconds) serves repeated identical searches from an
+    in-process LRU cache; it defaults to TAVILY_CACHE_TTL and 0 disables it.
+    Failed searches are never cached.
+    """
+    ttl = _cache_ttl() if expire_after is None else expire_after
+    if ttl <= 0:
+        return _search(query, max_results, search_depth, api_key)
+
+    cache_key = (query, max_results, search_depth)
+    cached = _cache_get(cache_key, ttl)
+    if cached is not None:
+        return cached
+    result = _search(query, max_results, search_depth, api_key)
+    if result["source"] != "error":
+        _cache_put(cache_key, result)
+    return result
+
+
+def _search(query: str, max_results: int, search_depth: str, api_key: str | None) -> dict:
     key = api_key or os.environ.get("TAVILY_API_KEY", "")
     if not key:
         return _duckduckgo_fallback(query, max_results)
@@ -42,16 +209,15 @@ def tavily_search(
         "include_answer": True,
     }).encode()
 
-    req = urllib.request.Request(
-        "https://api.tavily.com/search",
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode())
+        raw = _http_request(
+            "POST",
+            "https://api.tavily.com/search",
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=30,
+        )
+        data = json.loads(raw.decode())
     except (urllib.error.URLError, json.JSONDecodeError) as exc:
         return _duckduckgo_fallback(query, max_results)
 
@@ -73,58 +239,104 @@ def tavily_search(
     }
 
 
+_BATCH_CONCURRENCY = 8
+
+
+async def tavily_search_many(
+    queries: list[str],
+    *,
+    max_results: int = 5,
+    search_depth: str = "basic",
+    api_key: str | None = None,
+    concurrency: int = _BATCH_CONCURRENCY,
+) -> list[dict]:
+    """Run several searches concurrently; results keep the order of queries.
+
+    Each search runs tavily_search on a worker thread, so N queries cost
+    roughly the slowest round-trip instead of the sum. A failed query yields
+    an error result instead of aborting the batch.
+    """
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(query: str) -> dict:
+        async with limit:
+            return await asyncio.to_thread(
+                tavily_search,
+                query,
+                max_results=max_results,
+                search_depth=search_depth,
+                api_key=api_key,
+            )
+
+    outcomes = await asyncio.gather(*(run_one(q) for q in queries), return_exceptions=True)
+    results: list[dict] = []
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, BaseException):
+            outcome = {
+                "source": "error",
+                "query": query,
+                "answer": "",
+                "results": [],
+                "results_count": 0,
+                "error": str(outcome),
+            }
+        results.append(outcome)
+    return results
+
+
 # ── DuckDuckGo fallback ─────────────────────────────────────────
 
 
-class _DDGParser(HTMLParser):
-    """Minimal parser for DuckDuckGo HTML search results."""
-
-    def __init__(self) -> None:
-        super().__init__()
-        self.results: list[dict] = []
-        self._in_result = False
-        self._in_link = False
-        self._in_snippet = False
-        self._current: dict = {}
-        self._text_buf: list[str] = []
-
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        cls = dict(attrs).get("class", "")
-        if tag == "div" and "result__body" in cls:
-            self._in_result = True
-            self._current = {}
-        elif self._in_result and tag == "a" and "result__a" in cls:
-            self._in_link = True
-            self._current["url"] = dict(attrs).get("href", "")
-            self._text_buf = []
-        elif self._in_result and tag == "a" and "result__snippet" in cls:
-            self._in_snippet = True
-            self._text_buf = []
-
-    def handle_endtag(self, tag: str) -> None:
-        if self._in_link and tag == "a":
-            self._current["title"] = "".join(self._text_buf).strip()
-            self._in_link = False
-        elif self._in_snippet and tag == "a":
-            self._current["content"] = "".join(self._text_buf).strip()
-            self._in_snippet = False
-        elif self._in_result and tag == "div":
-            if self._current.get("title"):
-                self.results.append(self._current)
-            self._in_result = False
-
-    def handle_data(self, data: str) -> None:
-        if self._in_link or self._in_snippet:
-            self._text_buf.append(data)
+_ANCHOR_RE = re.compile(r"<a\s([^>]*)>(.*?)</a\s*>", re.S | re.I)
+_ATTR_RE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _anchor_attrs(raw: str) -> dict[str, str]:
+    return {
+        m.group(1).lower(): html.unescape(m.group(2) or m.group(3) or m.group(4) or "")
+        for m in _ATTR_RE.finditer(raw)
+    }
+
+
+def _strip_tags(fragment: str) -> str:
+    return html.unescape(_TAG_RE.sub("", fragment)).strip()
+
+
+def _extract_ddg_results(page: str, max_results: int) -> list[dict]:
+    """Pull result links and snippets out of DuckDuckGo HTML with compiled regexes.
+
+    Only result anchors are visited, and scanning stops once max_results
+    titled results are collected.
+    """
+    results: list[dict] = []
+    current: dict | None = None
+    for m in _ANCHOR_RE.finditer(page):
+        raw_attrs = m.group(1)
+        if "result__" not in raw_attrs:
+            continue
+        attrs = _anchor_attrs(raw_attrs)
+        classes = attrs.get("class", "").split()
+        if "result__a" in classes:
+            if current and current.get("title"):
+                results.append(current)
+                if len(results) >= max_results:
+                    return results
+            current = {"url": attrs.get("href", ""), "title": _strip_tags(m.group(2))}
+        elif "result__snippet" in classes and current is not None:
+            current["content"] = _strip_tags(m.group(2))
+    if current and current.get("title") and len(results) < max_results:
+        results.append(current)
+    return results
 
 
 def _duckduckgo_fallback(query: str, max_results: int) -> dict:
     """Scrape DuckDuckGo HTML as fallback when no API key."""
     url = f"https://html.duckduckgo.com/html/?q={urllib.parse.quote(query)}"
-    req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            html = resp.read().decode("utf-8", errors="replace")
+        page = _http_request("GET", url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15).decode(
+            "utf-8", errors="replace"
+        )
     except urllib.error.URLError:
         return {
             "source": "error",
@@ -134,9 +346,7 @@ def _duckduckgo_fallback(query: str, max_results: int) -> dict:
             "results_count": 0,
         }
 
-    parser = _DDGParser()
-    parser.feed(html)
-    results = parser.results[:max_results]
+    results = _extract_ddg_results(page, max_results)
     for r in results:
         r.setdefault("score", 0)
 
@@ -158,8 +368,18 @@ def main() -> None:
     parser.add_argument("--max-results", type=int, default=5)
     parser.add_argument("--depth", default="basic", choices=["basic", "advanced"])
     parser.add_argument("--json", dest="json_input", help="JSON input string")
+    parser.add_argument("--batch", action="store_true", help="read newline-delimited queries from stdin")
     args = parser.parse_args()
 
+    if args.batch:
+        queries = [line.strip() for line in sys.stdin if line.strip()]
+        if not queries:
+            parser.error("--batch requires at least one query on stdin")
+        batch = asyncio.run(tavily_search_many(queries, max_results=args.max_results, search_depth=args.depth))
+        json.dump(batch, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return
+
     if args.json_input:
         params = json.loads(args.json_input)
         query = params["query"]
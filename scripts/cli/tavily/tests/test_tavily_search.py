@@ -5,16 +5,17 @@ from __future__ import annotations
 import json
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
 
 from cli.tavily.tavily_search import (
-    _DDGParser,
     _duckduckgo_fallback,
+    _extract_ddg_results,
     tavily_search,
+    tavily_search_many,
 )
 
 
@@ -34,18 +35,15 @@ class TestTavilySearch:
 
     def test_with_api_key_calls_tavily(self):
         """When API key exists, should call Tavily API."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({
+        body = json.dumps({
             "query": "test",
             "answer": "Test answer",
             "results": [
                 {"title": "Result 1", "url": "https://example.com", "content": "Content 1", "score": 0.9},
             ],
         }).encode()
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
 
-        with patch("urllib.request.urlopen", return_value=mock_response):
+        with patch("cli.tavily.tavily_search._http_request", return_value=body):
             result = tavily_search("test", api_key="test-key")
             assert result["source"] == "tavily"
             assert result["answer"] == "Test answer"
@@ -56,7 +54,7 @@ class TestTavilySearch:
         """When Tavily API fails, should fallback to DuckDuckGo."""
         import urllib.error
 
-        with patch("urllib.request.urlopen", side_effect=urllib.error.URLError("timeout")):
+        with patch("cli.tavily.tavily_search._http_request", side_effect=urllib.error.URLError("timeout")):
             with patch(
                 "cli.tavily.tavily_search._duckduckgo_fallback",
                 return_value={"source": "duckduckgo", "query": "test", "results": [], "answer": "", "results_count": 0},
@@ -66,43 +64,218 @@ class TestTavilySearch:
 
     def test_max_results_parameter(self):
         """Should pass max_results to the API."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({
+        body = json.dumps({
             "query": "test", "answer": "", "results": [],
         }).encode()
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
 
-        with patch("urllib.request.urlopen", return_value=mock_response) as mock_urlopen:
+        with patch("cli.tavily.tavily_search._http_request", return_value=body) as mock_request:
             tavily_search("test", api_key="key", max_results=10)
-            call_args = mock_urlopen.call_args
-            req = call_args[0][0]
-            body = json.loads(req.data)
-            assert body["max_results"] == 10
-
-
-class TestDDGParser:
-    """Tests for the DuckDuckGo HTML parser."""
-
-    def test_parses_results(self):
-        html = """
-        <div class="result__body">
-            <a class="result__a" href="https://example.com">Example Title</a>
-            <a class="result__snippet">Example snippet text</a>
-        </div>
-        <div class="result__body">
-            <a class="result__a" href="https://other.com">Other Title</a>
-            <a class="result__snippet">Other snippet</a>
-        </div>
-        """
-        parser = _DDGParser()
-        parser.feed(html)
-        assert len(parser.results) == 2
-        assert parser.results[0]["title"] == "Example Title"
-        assert parser.results[0]["url"] == "https://example.com"
-        assert parser.results[1]["title"] == "Other Title"
-
-    def test_empty_html(self):
-        parser = _DDGParser()
-        parser.feed("<html><body></body></html>")
-        assert len(parser.results) == 0
+            sent = json.loads(mock_request.call_args.kwargs["data"])
+            assert sent["max_results"] == 10
+
+
+class TestTavilySearchMany:
+    """Tests for the concurrent batch entry point."""
+
+    def test_preserves_order_and_isolates_failures(self):
+        import asyncio
+
+        def fake_search(query, **kwargs):
+            if query == "bad":
+                raise RuntimeError("boom")
+            return {"source": "tavily", "query": query, "max_results": kwargs["max_results"]}
+
+        with patch("cli.tavily.tavily_search.tavily_search", side_effect=fake_search):
+            results = asyncio.run(tavily_search_many(["a", "bad", "c"], max_results=3))
+
+        assert [r["query"] for r in results] == ["a", "bad", "c"]
+        assert results[0]["max_results"] == 3
+        assert results[1]["source"] == "error"
+        assert results[1]["error"] == "boom"
+
+
+class TestResultCache:
+    """Tests for the opt-in TTL/LRU result cache."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        from cli.tavily import tavily_search as mod
+
+        mod._CACHE.clear()
+        yield
+        mod._CACHE.clear()
+
+    def _fake(self, query, max_results, search_depth, api_key):
+        return {"source": "tavily", "query": query, "results": [{"title": "t"}], "results_count": 1}
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("TAVILY_CACHE_TTL", raising=False)
+        with patch("cli.tavily.tavily_search._search", side_effect=self._fake) as search:
+            tavily_search("q")
+            tavily_search("q")
+        assert search.call_count == 2
+
+    def test_hit_within_ttl_returns_copy(self, monkeypatch):
+        monkeypatch.setenv("TAVILY_CACHE_TTL", "300")
+        with patch("cli.tavily.tavily_search._search", side_effect=self._fake) as search:
+            first = tavily_search("q")
+            first["results"].clear()
+            second = tavily_search("q")
+            tavily_search("q", max_results=3)
+        assert search.call_count == 2
+        assert second["results_count"] == len(second["results"]) == 1
+
+    def test_expiry_and_errors(self):
+        from cli.tavily import tavily_search as mod
+
+        with patch("cli.tavily.tavily_search._search", side_effect=self._fake) as search:
+            tavily_search("q", expire_after=10)
+            with patch("cli.tavily.tavily_search.time.monotonic", return_value=mod.time.monotonic() + 11):
+                tavily_search("q", expire_after=10)
+        assert search.call_count == 2
+
+        error = {"source": "error", "query": "e", "results": [], "results_count": 0}
+        with patch("cli.tavily.tavily_search._search", return_value=error) as search:
+            tavily_search("e", expire_after=10)
+            tavily_search("e", expire_after=10)
+        assert search.call_count == 2
+
+    def test_evicts_least_recently_used(self):
+        from cli.tavily import tavily_search as mod
+
+        with patch.object(mod, "_CACHE_MAXSIZE", 2), \
+                patch("cli.tavily.tavily_search._search", side_effect=self._fake):
+            tavily_search("a", expire_after=60)
+            tavily_search("b", expire_after=60)
+            tavily_search("a", expire_after=60)
+            tavily_search("c", expire_after=60)
+        assert [key[0] for key in mod._CACHE] == ["a", "c"]
+
+
+class TestExtractDDGResults:
+    """Tests for the regex-based DuckDuckGo extractor."""
+
+    HTML = """
+    <div class="result results_links web-result">
+      <div class="links_main links_deep result__body">
+        <h2 class="result__title">
+          <a rel="nofollow" class="result__a" href="https://example.com/?a=1&amp;b=2">Example <b>Title</b></a>
+        </h2>
+        <a class="result__url" href="https://example.com">example.com</a>
+        <a class="result__snippet" href="https://example.com">Snippet &amp; <b>bold</b> text</a>
+      </div>
+    </div>
+    <div class="result__body">
+      <a class="result__a" href="https://other.com">Other Title</a>
+    </div>
+    <div class="result__body">
+      <a class="result__a" href="https://third.com">Third</a>
+      <a class="result__snippet">Third snippet</a>
+    </div>
+    """
+
+    def test_extracts_result_fields(self):
+        results = _extract_ddg_results(self.HTML, 10)
+        assert results == [
+            {
+                "url": "https://example.com/?a=1&b=2",
+                "title": "Example Title",
+                "content": "Snippet & bold text",
+            },
+            {"url": "https://other.com", "title": "Other Title"},
+            {"url": "https://third.com", "title": "Third", "content": "Third snippet"},
+        ]
+
+    def test_stops_at_max_results(self):
+        results = _extract_ddg_results(self.HTML, 2)
+        assert [r["title"] for r in results] == ["Example Title", "Other Title"]
+
+    def test_fallback_uses_extractor(self):
+        with patch("cli.tavily.tavily_search._http_request", return_value=self.HTML.encode()):
+            result = _duckduckgo_fallback("q", 1)
+        assert result["source"] == "duckduckgo"
+        assert result["results_count"] == 1
+        assert result["results"][0]["score"] == 0
+
+
+class TestHTTPPool:
+    """Tests for the keep-alive connection pool."""
+
+    def test_reuses_connection_per_host(self, monkeypatch):
+        import http.server
+        import threading
+
+        from cli.tavily import tavily_search as mod
+
+        # no_proxy exempts the local server, so the pool is still used.
+        monkeypatch.setenv("http_proxy", "http://proxy.invalid:1")
+        monkeypatch.setenv("no_proxy", "127.0.0.1")
+        peers = set()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                peers.add(self.client_address)
+                body = b"ok"
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}/html/?q=x"
+        try:
+            assert mod._http_request("GET", url, timeout=5) == b"ok"
+            assert mod._http_request("GET", url, timeout=5) == b"ok"
+            assert len(peers) == 1
+
+            import urllib.error
+
+            with pytest.raises(urllib.error.HTTPError):
+                mod._http_request("POST", url, data=b"{}", timeout=5)
+        finally:
+            server.shutdown()
+            server.server_close()
+            with mod._CONNECTIONS_LOCK:
+                for conn in mod._CONNECTIONS.values():
+                    conn.close()
+                mod._CONNECTIONS.clear()
+
+    def test_configured_proxy_uses_urlopen(self, monkeypatch):
+        from cli.tavily import tavily_search as mod
+
+        monkeypatch.setenv("https_proxy", "http://proxy.internal:3128")
+        monkeypatch.setenv("no_proxy", "localhost")
+        seen = []
+
+        class FakeResponse:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def read(self):
+                return b"via-proxy"
+
+        def fake_urlopen(req, timeout):
+            seen.append((req.get_method(), req.full_url, req.data, timeout))
+            return FakeResponse()
+
+        monkeypatch.setattr(mod.urllib.request, "urlopen", fake_urlopen)
+        body = mod._http_request("POST", "https://api.tavily.com/search", data=b"{}", timeout=7)
+        assert body == b"via-proxy"
+        assert seen == [("POST", "https://api.tavily.com/search", b"{}", 7)]
+        assert not mod._CONNECTIONS
@@ -13,6 +13,7 @@ import pytest
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
 
 from cli.timer.timer_cli import (
+    _load_timers,
     _parse_delay,
     cancel_timer,
     list_timers,
@@ -36,6 +37,13 @@ class TestParseDelay:
     def test_whitespace(self):
         assert _parse_delay("  10m  ") == 600
 
+    def test_uppercase_unit(self):
+        assert _parse_delay("2H") == 7200
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="invalid delay"):
+            _parse_delay("soon")
+
 
 class TestSetTimer:
     def test_creates_timer(self, tmp_path):
@@ -47,9 +55,12 @@ class TestSetTimer:
             assert result["timer"]["status"] == "active"
             assert result["timer"]["id"].startswith("timer-")
 
-            # Verify file written
-            timers = json.loads(timer_file.read_text())
-            assert len(timers) == 1
+            # Verify a single JSONL record was appended
+            lines = timer_file.read_text().splitlines()
+            assert len(lines) == 1
+            assert json.loads(lines[0])["task"] == "drink water"
+            assert "fire_at_human" not in json.loads(lines[0])
+            assert result["timer"]["fire_at_human"]
 
     def test_missing_delay(self, tmp_path):
         timer_file = tmp_path / "timers.json"
@@ -63,14 +74,33 @@ class TestSetTimer:
             result = set_timer({"delay": "5m"})
             assert result["success"] is False
 
+    def test_invalid_delay(self, tmp_path):
+        timer_file = tmp_path / "timers.json"
+        with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
+            result = set_timer({"delay": "-5m", "task": "bad"})
+            assert result["success"] is False
+            assert "invalid delay" in result["error"]
+            assert not timer_file.exists()
+
     def test_multiple_timers(self, tmp_path):
         timer_file = tmp_path / "timers.json"
         with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
             set_timer({"delay": "5m", "task": "task 1"})
             set_timer({"delay": "10m", "task": "task 2"})
-            timers = json.loads(timer_file.read_text())
+            timers = _load_timers()
             assert len(timers) == 2
 
+    def test_same_millisecond_timers_get_distinct_ids(self, tmp_path):
+        timer_file = tmp_path / "timers.json"
+        with (
+            patch("cli.timer.timer_cli._TIMER_FILE", timer_file),
+            patch("cli.timer.timer_cli.time.time", return_value=1_000_000.5),
+        ):
+            first = set_timer({"delay": "5m", "task": "task 1"})
+            second = set_timer({"delay": "10m", "task": "task 2"})
+            assert first["timer"]["id"] != second["timer"]["id"]
+            assert [t["task"] for t in _load_timers()] == ["task 1", "task 2"]
+
 
 class TestListTimers:
     def test_empty_list(self, tmp_path):
@@ -92,6 +122,92 @@ class TestListTimers:
         with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
             result = list_timers()
             assert result["timers"][0]["status"] == "fired"
+            assert result["timers"][0]["fire_at_human"]
+
+    def test_only_due_timers_fire(self, tmp_path):
+        timer_file = tmp_path / "timers.json"
+        now = time.time()
+        timers = [
+            {"id": "timer-1", "task": "later", "fire_at": now + 100, "status": "active"},
+            {"id": "timer-2", "task": "past", "fire_at": now - 50, "status": "active"},
+            {"id": "timer-3", "task": "gone", "fire_at": now - 100, "status": "cancelled"},
+            {"id": "timer-4", "task": "older", "fire_at": now - 100, "status": "active"},
+        ]
+        timer_file.write_text(json.dumps(timers))
+        with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
+            result = list_timers()
+            statuses = [t["status"] for t in result["timers"]]
+            assert statuses == ["active", "fired", "cancelled", "fired"]
+            assert [t["status"] for t in _load_timers()] == statuses
+
+    def test_read_only_when_nothing_fired(self, tmp_path):
+        timer_file = tmp_path / "timers.json"
+        with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
+            set_timer({"delay": "10m", "task": "pending"})
+            before = timer_file.read_bytes()
+            with patch("cli.timer.timer_cli._save_timers") as save, \
+                    patch("cli.timer.timer_cli._append_record") as append:
+                list_timers()
+            save.assert_not_called()
+            append.assert_not_called()
+            assert timer_file.read_bytes() == before
+
+
+class TestTimerLog:
+    def test_compacts_when_log_grows(self, tmp_path):
+        timer_file = tmp_path / "timers.json"
+        lines = [json.dumps({"id": "timer-1", "task": "t", "fire_at": time.time() + 1000, "status": "active"})]
+        lines += [json.dumps({"id": "timer-1", "op": "cancel"})] * 100
+        timer_file.write_text("\n".join(lines) + "\n")
+        with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
+            timers = _load_timers()
+        assert len(timers) == 1
+        assert timers[0]["status"] == "cancelled"
+        assert len(timer_file.read_text().splitlines()) == 1
+
+    def test_unchanged_file_is_not_reparsed(self, tmp_path):
+        timer_file = tmp_path / "timers.json"
+        with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
+            set_timer({"delay": "10m", "task": "cached"})
+            first = _load_timers()
+            with patch("cli.timer.timer_cli._loads", side_effect=AssertionError("reparsed")):
+                second = _load_timers()
+            assert second == first
+            second[0]["status"] = "mutated"
+            assert _load_timers()[0]["status"] == "active"
+
+    def test_non_ascii_tasks_round_trip_as_utf8(self, tmp_path):
+        timer_file = tmp_path / "timers.json"
+        with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
+            set_timer({"delay": "10m", "task": "喝水"})
+            set_timer({"delay": "1s", "task": "提醒"})
+            with patch("cli.timer.timer_cli.time.time", return_value=time.time() + 60):
+                list_timers()
+            timers = _load_timers()
+        assert [t["task"] for t in timers] == ["喝水", "提醒"]
+        assert "喝水" in timer_file.read_text(encoding="utf-8")
+
+    def test_drops_torn_trailing_record(self, tmp_path):
+        timer_file = tmp_path / "timers.json"
+        with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
+            set_timer({"delay": "10m", "task": "kept"})
+            with timer_file.open("a") as f:
+                f.write('{"id": "timer-9", "task": "tor')
+            timers = _load_timers()
+            assert [t["task"] for t in timers] == ["kept"]
+            assert timer_file.read_text().endswith("\n")
+            assert not (tmp_path / "timers.json.tmp").exists()
+
+    def test_append_after_torn_record_keeps_log_readable(self, tmp_path):
+        timer_file = tmp_path / "timers.json"
+        with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
+            set_timer({"delay": "10m", "task": "kept"})
+            with timer_file.open("a") as f:
+                f.write('{"id": "timer-9", "task": "tor')
+            set_timer({"delay": "10m", "task": "after"})
+            timers = _load_timers()
+            assert [t["task"] for t in timers] == ["kept", "after"]
+            assert cancel_timer({"id": timers[1]["id"]})["success"] is True
 
 
 class TestCancelTimer:
@@ -106,8 +222,11 @@ class TestCancelTimer:
         with patch("cli.timer.timer_cli._TIMER_FILE", timer_file):
             result = cancel_timer({"id": "timer-42"})
             assert result["success"] is True
-            timers = json.loads(timer_file.read_text())
+            timers = _load_timers()
             assert timers[0]["status"] == "cancelled"
+            # Legacy array was compacted to JSONL, then a tombstone appended.
+            last = json.loads(timer_file.read_text().splitlines()[-1])
+            assert last == {"id": "timer-42", "op": "cancel"}
 
     def test_cancel_nonexistent(self, tmp_path):
         timer_file = tmp_path / "timers.json"
@@ -16,33 +16,142 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
 import sys
 import time
+import uuid
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Both parsers accept the raw bytes read from the timer file.
+_loads = orjson.loads if orjson is not None else json.loads
+
 _TIMER_FILE = Path(os.environ.get("ELEPHANT_TIMER_FILE", "/tmp/elephant_timers.json"))
 
 
+# The timer file is an append-only JSONL log: full timer records plus
+# {"id": ..., "op": ...} status updates, folded last-write-wins by id.
+# Legacy files holding a single JSON array are still read and get compacted.
+_OP_STATUS = {"cancel": "cancelled", "fire": "fired"}
+# Rewrite the log once it holds this many more records than live timers.
+_COMPACT_SLACK = 64
+
+
+# Parsed log keyed by (path, st_mtime_ns, st_size); any write changes the key.
+_CACHE: tuple[tuple[str, int, int], list[dict]] | None = None
+
+
+def _stat_key() -> tuple[str, int, int] | None:
+    try:
+        st = _TIMER_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return (str(_TIMER_FILE), st.st_mtime_ns, st.st_size)
+
+
+def _remember(timers: list[dict]) -> None:
+    global _CACHE
+    key = _stat_key()
+    _CACHE = (key, [dict(t) for t in timers]) if key is not None else None
+
+
 def _load_timers() -> list[dict]:
-    if _TIMER_FILE.exists():
-        return json.loads(_TIMER_FILE.read_text())
-    return []
+    key = _stat_key()
+    if key is None:
+        return []
+    if _CACHE is not None and _CACHE[0] == key:
+        return [dict(t) for t in _CACHE[1]]
+
+    try:
+        fd = os.open(_TIMER_FILE, os.O_RDONLY)
+    except FileNotFoundError:
+        return []
+    try:
+        buf = os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
+    if buf.lstrip().startswith(b"["):
+        timers = _loads(buf)
+        _save_timers(timers)
+        return timers
+
+    lines = buf.split(b"\n")
+    # An append cut short by a crash leaves an unterminated last line, or a
+    # terminated fragment once _append_record has run; drop either and compact.
+    torn = lines.pop() != b""
+
+    by_id: dict[str, dict] = {}
+    records = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = _loads(line)
+        except json.JSONDecodeError:
+            torn = True
+            continue
+        records += 1
+        op = record.get("op")
+        if op is None:
+            by_id[record["id"]] = record
+        elif record["id"] in by_id:
+            by_id[record["id"]]["status"] = _OP_STATUS[op]
+
+    timers = list(by_id.values())
+    if torn or records > 2 * len(timers) + _COMPACT_SLACK:
+        _save_timers(timers)
+    else:
+        _remember(timers)
+    return timers
+
+
+def _append_record(*records: dict) -> None:
+    data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records)
+    with _TIMER_FILE.open("a+b") as f:
+        # Terminate a torn tail first so the new records start on their own line.
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                data = "\n" + data
+        f.write(data.encode("utf-8"))
 
 
 def _save_timers(timers: list[dict]) -> None:
-    _TIMER_FILE.write_text(json.dumps(timers, ensure_ascii=False, indent=2))
+    """Rewrite the log as one record per live timer (compaction).
+
+    The new log is written beside the old one and swapped in with
+    ``os.replace`` so readers never observe a half-written file.
+    """
+    tmp = _TIMER_FILE.with_name(_TIMER_FILE.name + ".tmp")
+    tmp.write_text(
+        "".join(json.dumps(t, ensure_ascii=False, separators=(",", ":")) + "\n" for t in timers),
+        encoding="utf-8",
+    )
+    os.replace(tmp, _TIMER_FILE)
+    _remember(timers)
+
+
+_DELAY_RE = re.compile(r"^\s*(\d+)\s*([hms]?)\s*$", re.IGNORECASE)
+_DELAY_UNIT_SECONDS = {"": 1, "s": 1, "m": 60, "h": 3600}
 
 
 def _parse_delay(delay_str: str) -> int:
     """Parse delay string like '30m', '2h', '90s' to seconds."""
-    s = delay_str.strip().lower()
-    if s.endswith("h"):
-        return int(s[:-1]) * 3600
-    if s.endswith("m"):
-        return int(s[:-1]) * 60
-    if s.endswith("s"):
-        return int(s[:-1])
-    return int(s)
+    m = _DELAY_RE.match(delay_str)
+    if m is None:
+        raise ValueError(f"invalid delay {delay_str!r}: expected <int>[h|m|s]")
+    return int(m.group(1)) * _DELAY_UNIT_SECONDS[m.group(2).lower()]
+
+
+def _human_time(ts: float) -> str:
+    """Display form of a fire_at timestamp; computed on read, never stored."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
 
 
 def set_timer(args: dict) -> dict:
@@ -51,33 +160,41 @@ def set_timer(args: dict) -> dict:
     if not delay or not task:
         return {"success": False, "error": "delay and task are required"}
 
-    seconds = _parse_delay(delay)
+    try:
+        seconds = _parse_delay(delay)
+    except ValueError as exc:
+        return {"success": False, "error": str(exc)}
     fire_at = time.time() + seconds
-    timer_id = f"timer-{int(time.time() * 1000) % 100000}"
+    # Records are folded by id, so ids must never repeat across set calls.
+    timer_id = f"timer-{uuid.uuid4().hex[:8]}"
 
-    timers = _load_timers()
     entry = {
         "id": timer_id,
         "task": task,
         "delay": delay,
         "fire_at": fire_at,
-        "fire_at_human": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(fire_at)),
         "created": time.time(),
         "status": "active",
     }
-    timers.append(entry)
-    _save_timers(timers)
+    _append_record(entry)
 
-    return {"success": True, "timer": entry}
+    return {"success": True, "timer": {**entry, "fire_at_human": _human_time(fire_at)}}
 
 
 def list_timers() -> dict:
     timers = _load_timers()
     now = time.time()
-    for t in timers:
-        if t["status"] == "active" and t["fire_at"] < now:
+    fired = []
+    for t in sorted(timers, key=lambda t: t["fire_at"]):
+        if t["fire_at"] >= now:
+            break
+        if t["status"] == "active":
             t["status"] = "fired"
-    _save_timers(timers)
+            fired.append({"id": t["id"], "op": "fire"})
+    if fired:
+        _append_record(*fired)
+    for t in timers:
+        t["fire_at_human"] = _human_time(t["fire_at"])
     return {"success": True, "timers": timers, "count": len(timers)}
 
 
@@ -87,17 +204,10 @@ def cancel_timer(args: dict) -> dict:
         return {"success": False, "error": "id is required"}
 
     timers = _load_timers()
-    found = False
-    for t in timers:
-        if t["id"] == timer_id:
-            t["status"] = "cancelled"
-            found = True
-            break
-
-    if not found:
+    if not any(t["id"] == timer_id for t in timers):
         return {"success": False, "error": f"timer {timer_id} not found"}
 
-    _save_timers(timers)
+    _append_record({"id": timer_id, "op": "cancel"})
     return {"success": True, "message": f"timer {timer_id} cancelled"}
 
 
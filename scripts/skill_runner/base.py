@@ -9,6 +9,15 @@ import traceback
 from dataclasses import dataclass, field
 from typing import Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+# one exception type whichever parser is active. Both accept bytes.
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 @dataclass
 class SkillResult:
@@ -100,24 +109,41 @@ class Skill:
                 error=f"{type(exc).__name__}: {exc}",
             )
         # Always output valid JSON to stdout
-        json.dump(result.to_dict(), sys.stdout, ensure_ascii=False)
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+        cls._write_json_line(result.to_dict())
         sys.exit(0 if result.success else 1)
 
     # ── internal ─────────────────────────────────────────────────
 
+    @staticmethod
+    def _write_json_line(payload: dict[str, Any]) -> None:
+        """Write one JSON line, as UTF-8 bytes via orjson when possible."""
+        out = getattr(sys.stdout, "buffer", None)
+        if orjson is not None and out is not None:
+            try:
+                data = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+            except TypeError:
+                pass  # e.g. integers beyond 64 bits; the stdlib encoder handles those
+            else:
+                sys.stdout.flush()
+                out.write(data)
+                out.flush()
+                return
+        json.dump(payload, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
     @staticmethod
     def _parse_input() -> dict[str, Any]:
         """Read input from CLI arg or stdin."""
         if len(sys.argv) > 1:
-            raw = sys.argv[1]
+            raw: str | bytes = sys.argv[1]
         elif not sys.stdin.isatty():
-            raw = sys.stdin.read()
+            # Read raw bytes so large inline payloads skip the text decoder.
+            raw = getattr(sys.stdin, "buffer", sys.stdin).read()
         else:
             return {}
         try:
-            return json.loads(raw)
+            return _loads(raw)
         except json.JSONDecodeError as exc:
             print(
                 json.dumps({"success": False, "error": f"invalid JSON input: {exc}"}),
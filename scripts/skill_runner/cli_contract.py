@@ -5,7 +5,8 @@ from __future__ import annotations
 import ast
 import json
 import re
-from typing import Any, Sequence
+import sys
+from typing import Any, NoReturn, Sequence
 
 try:
     import yaml
@@ -300,3 +301,14 @@ def render_result(result: Any) -> tuple[str, str, int]:
         stderr_parts.append("command failed")
 
     return "", "\n".join(stderr_parts).strip(), 1
+
+
+def emit_result(result: Any) -> NoReturn:
+    """Render run() output, write each stream once, and exit with its code."""
+
+    stdout_text, stderr_text, exit_code = render_result(result)
+    if stdout_text:
+        sys.stdout.write(stdout_text + "\n")
+    if stderr_text:
+        sys.stderr.write(stderr_text + "\n")
+    sys.exit(exit_code)
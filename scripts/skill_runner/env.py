@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 from pathlib import Path
 from typing import Callable
@@ -9,7 +10,9 @@ from typing import Callable
 LoadDotenvFn = Callable[..., bool]
 
 _LOADED_PATHS: set[Path] = set()
-_LOAD_DOTENV_FN: LoadDotenvFn | None = None
+# python-dotenv's load_dotenv, imported on first use; None if it is not
+# installed and False while not looked up yet.
+_PYTHON_DOTENV_FN: LoadDotenvFn | None | bool = False
 
 
 def _home_alex_root(path: Path) -> Path | None:
@@ -31,18 +34,15 @@ def _iter_path_to_root(path: Path, *, stop: Path | None = None):
         current = parent
 
 
-def _iter_search_roots(start_path: str | os.PathLike[str] | None = None):
-    base = Path(start_path or Path.cwd()).resolve()
+def _iter_search_roots(start: str, cwd: str, repo_root: str):
+    base = Path(start).resolve()
     if base.is_file():
         base = base.parent
 
     roots = [base]
-
-    repo_root = os.environ.get("ALEX_REPO_ROOT", "").strip()
     if repo_root:
         roots.append(Path(repo_root).expanduser().resolve())
-
-    roots.append(Path.cwd().resolve())
+    roots.append(Path(cwd).resolve())
 
     seen: set[Path] = set()
     for root in roots:
@@ -52,24 +52,49 @@ def _iter_search_roots(start_path: str | os.PathLike[str] | None = None):
         yield root
 
 
-def find_dotenv(start_path: str | os.PathLike[str] | None = None) -> Path | None:
-    for root in _iter_search_roots(start_path):
+@functools.lru_cache(maxsize=128)
+def _find_dotenv_cached(start: str, cwd: str, repo_root: str) -> Path | None:
+    # The search roots usually share most of their ancestors; stat each
+    # directory's .env at most once across all of them.
+    checked: set[str] = set()
+    for root in _iter_search_roots(start, cwd, repo_root):
         stop_at = _home_alex_root(root)
         for current in _iter_path_to_root(root, stop=stop_at):
-            candidate = current / ".env"
-            if candidate.is_file():
-                return candidate
+            directory = str(current)
+            if directory in checked:
+                continue
+            checked.add(directory)
+            candidate = os.path.join(directory, ".env")
+            if os.path.isfile(candidate):
+                return Path(candidate)
     return None
 
 
+def find_dotenv(start_path: str | os.PathLike[str] | None = None) -> Path | None:
+    cwd = os.getcwd()
+    start = os.fspath(start_path) if start_path else cwd
+    repo_root = os.environ.get("ALEX_REPO_ROOT", "").strip()
+    found = _find_dotenv_cached(start, cwd, repo_root)
+    if found is not None and not os.path.isfile(found):
+        # The cached .env was removed since; walk again.
+        _find_dotenv_cached.cache_clear()
+        found = _find_dotenv_cached(start, cwd, repo_root)
+    return found
+
+
 def _simple_load_dotenv(*, dotenv_path: str | os.PathLike[str], override: bool = False) -> bool:
-    """Minimal dotenv loader that avoids runtime package installation."""
-    path = Path(dotenv_path)
-    if not path.is_file():
+    """Minimal dotenv loader that avoids runtime package installation.
+
+    Used only when python-dotenv is not installed. Handles ``KEY=VALUE``
+    lines, ``export`` prefixes, ``#`` comment lines and matching outer quotes.
+    """
+    try:
+        text = Path(dotenv_path).read_text(encoding="utf-8")
+    except (FileNotFoundError, IsADirectoryError):
         return False
 
     loaded = False
-    for raw_line in path.read_text(encoding="utf-8").splitlines():
+    for raw_line in text.splitlines():
         line = raw_line.strip()
         if not line or line.startswith("#"):
             continue
@@ -92,19 +117,20 @@ def _simple_load_dotenv(*, dotenv_path: str | os.PathLike[str], override: bool =
     return loaded
 
 
-def _resolve_load_dotenv() -> LoadDotenvFn | None:
-    global _LOAD_DOTENV_FN
-    if _LOAD_DOTENV_FN is not None:
-        return _LOAD_DOTENV_FN
+def _python_dotenv_loader() -> LoadDotenvFn | None:
+    global _PYTHON_DOTENV_FN
+    if _PYTHON_DOTENV_FN is False:
+        try:
+            from dotenv import load_dotenv
+        except Exception:
+            _PYTHON_DOTENV_FN = None
+        else:
+            _PYTHON_DOTENV_FN = load_dotenv
+    return _PYTHON_DOTENV_FN
 
-    try:
-        from dotenv import load_dotenv
 
-        _LOAD_DOTENV_FN = load_dotenv
-        return _LOAD_DOTENV_FN
-    except Exception:
-        _LOAD_DOTENV_FN = _simple_load_dotenv
-        return _LOAD_DOTENV_FN
+def _resolve_load_dotenv() -> LoadDotenvFn | None:
+    return _python_dotenv_loader() or _simple_load_dotenv
 
 
 def load_repo_dotenv(
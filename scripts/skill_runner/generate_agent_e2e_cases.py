@@ -4,13 +4,14 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import pathlib
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
-import yaml
-
 
 @dataclass
 class SkillMeta:
@@ -24,16 +25,63 @@ def _repo_root() -> pathlib.Path:
     return pathlib.Path(__file__).resolve().parents[2]
 
 
+# discover_skills only needs these top-level keys; when they are plain
+# one-line scalars they are read directly instead of parsing the whole header.
+_FRONT_MATTER_FIELDS = ("name", "description")
+_FRONT_MATTER_KEY_RE = re.compile(r"^([A-Za-z_][\w-]*):[ \t]*(.*?)[ \t]*$", re.M)
+# Values that YAML would not read back as the same plain string.
+_YAML_VALUE_PREFIXES = ("[", "{", "|", ">", '"', "'", "&", "*", "!", "%", "@", "`")
+_YAML_NON_STRINGS = frozenset({"~", "null", "true", "false", "yes", "no", "on", "off"})
+
+
+def _scan_front_matter_fields(header: str) -> dict[str, Any] | None:
+    """Return the wanted fields, or None when the header needs a YAML parse."""
+    fields: dict[str, Any] = {}
+    for match in _FRONT_MATTER_KEY_RE.finditer(header):
+        key, value = match.groups()
+        if key not in _FRONT_MATTER_FIELDS:
+            continue
+        if (
+            not value
+            or value.startswith(_YAML_VALUE_PREFIXES)
+            or " #" in value
+            or ": " in value
+            or value.lower() in _YAML_NON_STRINGS
+            or header.startswith((" ", "\t"), match.end() + 1)
+        ):
+            return None
+        fields[key] = value
+    return fields
+
+
+_FRONT_MATTER_READ_SIZE = 4096
+
+
 def _read_front_matter(skill_md: pathlib.Path) -> dict[str, Any]:
-    content = skill_md.read_text(encoding="utf-8")
-    if not content.startswith("---\n"):
-        return {}
-    parts = content.split("\n---\n", 1)
-    if len(parts) != 2:
-        return {}
-    header = parts[0].removeprefix("---\n")
+    # Front matter sits at the top of the file; read only until its closing
+    # delimiter instead of loading the whole document.
+    fd = os.open(skill_md, os.O_RDONLY)
+    try:
+        buf = os.read(fd, _FRONT_MATTER_READ_SIZE)
+        if not buf.startswith(b"---\n"):
+            return {}
+        start = 4
+        while (end := buf.find(b"\n---\n", start)) < 0:
+            chunk = os.read(fd, _FRONT_MATTER_READ_SIZE)
+            if not chunk:
+                return {}
+            start = max(4, len(buf) - 4)
+            buf += chunk
+    finally:
+        os.close(fd)
+    header = buf[4:end].decode("utf-8")
+    fields = _scan_front_matter_fields(header)
+    if fields is not None:
+        return fields
+    import yaml
+
     try:
-        parsed = yaml.safe_load(header)
+        parsed = yaml.load(header, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     except yaml.YAMLError:
         return {}
     if isinstance(parsed, dict):
@@ -41,39 +89,112 @@ def _read_front_matter(skill_md: pathlib.Path) -> dict[str, Any]:
     return {}
 
 
-def discover_skills(root: pathlib.Path) -> list[SkillMeta]:
-    skills_root = root / "skills"
-    out: list[SkillMeta] = []
-    for entry in sorted(skills_root.iterdir(), key=lambda p: p.name):
-        if not entry.is_dir():
-            continue
-        skill_md = entry / "SKILL.md"
-        if not skill_md.exists():
-            continue
+def _process_entry(
+    entry: pathlib.Path, cache: dict[str, Any]
+) -> tuple[SkillMeta | None, dict[str, Any] | None]:
+    skill_md = entry / "SKILL.md"
+    try:
+        st = skill_md.stat()
+    except OSError:
+        return None, None
+    record = cache.get(entry.name)
+    if not (
+        isinstance(record, dict)
+        and record.get("mtime_ns") == st.st_mtime_ns
+        and record.get("size") == st.st_size
+    ):
         meta = _read_front_matter(skill_md)
-        skill_name = str(meta.get("name") or entry.name).strip()
-        description = str(meta.get("description") or "").strip()
-        out.append(
-            SkillMeta(
-                skill_name=skill_name,
-                skill_dir=entry.name,
-                has_run_script=(entry / "run.py").exists(),
-                description=description,
-            )
-        )
-    return out
+        record = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "name": str(meta.get("name") or entry.name).strip(),
+            "description": str(meta.get("description") or "").strip(),
+        }
+    skill = SkillMeta(
+        skill_name=record["name"],
+        skill_dir=entry.name,
+        has_run_script=(entry / "run.py").exists(),
+        description=record["description"],
+    )
+    return skill, record
+
+
+_DISCOVER_WORKERS = 16
+
+# Bump whenever front-matter parsing changes so cached entries are dropped.
+_META_CACHE_VERSION = 1
+
+
+def _load_meta_cache(path: pathlib.Path, skills_root: pathlib.Path) -> dict[str, Any]:
+    try:
+        cache = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(cache, dict)
+        or cache.get("version") != _META_CACHE_VERSION
+        or cache.get("skills_root") != str(skills_root)
+        or not isinstance(cache.get("skills"), dict)
+    ):
+        return {}
+    return cache["skills"]
+
+
+def discover_skills(root: pathlib.Path, cache_path: pathlib.Path | None = None) -> list[SkillMeta]:
+    """List skills under ``root/skills``.
+
+    With ``cache_path``, parsed front matter is kept in that JSON file and
+    reused per skill dir while SKILL.md's mtime and size are unchanged.
+    """
+    skills_root = root / "skills"
+    # scandir reports the entry type from the directory listing, so picking
+    # out skill dirs costs no extra stat per entry.
+    with os.scandir(skills_root) as it:
+        names = sorted(entry.name for entry in it if entry.is_dir())
+    entries = [skills_root / name for name in names]
+    if not entries:
+        return []
+    cache = _load_meta_cache(cache_path, skills_root.resolve()) if cache_path is not None else {}
+    # Each skill is a few independent stats/reads; overlap them on threads.
+    with ThreadPoolExecutor(max_workers=min(_DISCOVER_WORKERS, len(entries))) as pool:
+        results = list(pool.map(lambda entry: _process_entry(entry, cache), entries))
+
+    fresh = {
+        entry.name: record for entry, (_, record) in zip(entries, results) if record is not None
+    }
+    if cache_path is not None and fresh != cache:
+        payload = {
+            "version": _META_CACHE_VERSION,
+            "skills_root": str(skills_root.resolve()),
+            "skills": fresh,
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        except OSError:
+            pass
+    return [skill for skill, _ in results if skill is not None]
+
+
+def _default_meta_cache_path() -> pathlib.Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return pathlib.Path(cache_home) / "elephant.ai" / "skill_meta_cache.json"
+
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
 
 
 def _case_id(skill_name: str) -> str:
-    normalized = re.sub(r"[^a-z0-9]+", "-", skill_name.lower()).strip("-")
+    normalized = _SLUG_RE.sub("-", skill_name.lower()).strip("-")
     return f"skills-tool-e2e-{normalized}"
 
 
+_EXEC_COMMAND_TMPL = "python3 skills/{skill_dir}/run.py <command> [args]"
+
+
 def _build_prompt(skill: SkillMeta) -> str:
     if skill.has_run_script:
-        exec_command = (
-            f"python3 skills/{skill.skill_dir}/run.py <command> [args]"
-        )
+        exec_command = _EXEC_COMMAND_TMPL.format(skill_dir=skill.skill_dir)
         py_line = (
             "Set `has_python_entrypoint` to true and set `exec_command` to "
             f"\"{exec_command}\" exactly."
@@ -98,23 +219,20 @@ def _build_prompt(skill: SkillMeta) -> str:
 
 
 def build_cases(skills: list[SkillMeta]) -> dict[str, Any]:
-    cases: list[dict[str, Any]] = []
-    for skill in sorted(skills, key=lambda s: s.skill_name.lower()):
-        cases.append(
-            {
-                "id": _case_id(skill.skill_name),
-                "skill_name": skill.skill_name,
-                "skill_dir": skill.skill_dir,
-                "description": skill.description,
-                "has_run_script": skill.has_run_script,
-                "expected_exec_command": (
-                    f"python3 skills/{skill.skill_dir}/run.py <command> [args]"
-                    if skill.has_run_script
-                    else ""
-                ),
-                "prompt": _build_prompt(skill),
-            }
-        )
+    cases: list[dict[str, Any]] = [
+        {
+            "id": _case_id(skill.skill_name),
+            "skill_name": skill.skill_name,
+            "skill_dir": skill.skill_dir,
+            "description": skill.description,
+            "has_run_script": skill.has_run_script,
+            "expected_exec_command": (
+                _EXEC_COMMAND_TMPL.format(skill_dir=skill.skill_dir) if skill.has_run_script else ""
+            ),
+            "prompt": _build_prompt(skill),
+        }
+        for skill in sorted(skills, key=lambda s: s.skill_name.lower())
+    ]
     return {
         "version": 1,
         "description": "Per-skill end-to-end agent cases validating `skills` tool effectiveness.",
@@ -129,15 +247,23 @@ def main() -> None:
         default="evaluation/skills_e2e/cases.yaml",
         help="Output YAML file path, relative to repo root unless absolute.",
     )
+    parser.add_argument(
+        "--meta-cache",
+        action="store_true",
+        help="Reuse parsed SKILL.md front matter from $XDG_CACHE_HOME/elephant.ai/skill_meta_cache.json.",
+    )
     args = parser.parse_args()
 
+    # Imported here so --help does not pay for PyYAML.
+    import yaml
+
     root = _repo_root()
     output = pathlib.Path(args.output)
     if not output.is_absolute():
         output = root / output
     output.parent.mkdir(parents=True, exist_ok=True)
 
-    skills = discover_skills(root)
+    skills = discover_skills(root, _default_meta_cache_path() if args.meta_cache else None)
     payload = build_cases(skills)
     output.write_text(
         yaml.safe_dump(payload, sort_keys=False, allow_unicode=True), encoding="utf-8"
@@ -242,17 +242,7 @@ def launch_worker(
 def run_skill_main(run_fn) -> None:
     """Standard entry point for openMax family skills."""
     # Import here to avoid circular dependency if openmax_utils is imported early.
-    from skill_runner.cli_contract import parse_cli_args, render_result  # noqa: PLC0415
+    from skill_runner.cli_contract import emit_result, parse_cli_args  # noqa: PLC0415
 
     args = parse_cli_args(sys.argv[1:])
-    result = run_fn(args)
-    stdout_text, stderr_text, exit_code = render_result(result)
-    if stdout_text:
-        sys.stdout.write(stdout_text)
-        if not stdout_text.endswith("\n"):
-            sys.stdout.write("\n")
-    if stderr_text:
-        sys.stderr.write(stderr_text)
-        if not stderr_text.endswith("\n"):
-            sys.stderr.write("\n")
-    sys.exit(exit_code)
+    emit_result(run_fn(args))
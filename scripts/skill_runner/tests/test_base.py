@@ -89,6 +89,14 @@ class TestSkillRun:
                 EchoSkill.run()
             assert exc_info.value.code == 0
 
+    def test_prints_single_json_line(self, capfd):
+        with patch.object(sys, "argv", ["run.py", '{"action":"greet","name":"象"}']):
+            with pytest.raises(SystemExit):
+                EchoSkill.run()
+        out = capfd.readouterr().out
+        assert out.endswith("\n") and out.count("\n") == 1
+        assert json.loads(out) == {"success": True, "data": {"action": "greet", "name": "象"}}
+
     def test_parse_empty_args(self):
         with patch.object(sys, "argv", ["run.py"]):
             with patch.object(sys.stdin, "isatty", return_value=True):
@@ -102,6 +110,13 @@ class TestSkillRun:
                 EchoSkill.run()
             assert exc_info.value.code == 1
 
+    def test_parse_stdin_bytes(self):
+        import io
+
+        stdin = io.TextIOWrapper(io.BytesIO('{"action":"greet","name":"象"}'.encode()), encoding="utf-8")
+        with patch.object(sys, "argv", ["run.py"]), patch.object(sys, "stdin", stdin):
+            assert Skill._parse_input() == {"action": "greet", "name": "象"}
+
     def test_invalid_json_exits_with_error(self):
         with patch.object(sys, "argv", ["run.py", "not-json"]):
             with pytest.raises(SystemExit) as exc_info:
@@ -44,6 +44,37 @@ def test_simple_load_dotenv_supports_export_and_quoted_values(tmp_path, monkeypa
     assert os.environ["C"] == "three words"
 
 
+def test_simple_load_dotenv_trims_spacing_and_keeps_existing_keys(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "  SPACED = padded value  \r\nKEEP=from-file\r\nEMPTY=\r\n=orphan\r\nexport =x\r\n",
+        encoding="utf-8",
+    )
+    monkeypatch.delenv("SPACED", raising=False)
+    monkeypatch.delenv("EMPTY", raising=False)
+    monkeypatch.delenv("export", raising=False)
+    monkeypatch.setenv("KEEP", "from-env")
+
+    assert _mod._simple_load_dotenv(dotenv_path=env_file, override=False) is True
+    assert os.environ["SPACED"] == "padded value"
+    assert os.environ["KEEP"] == "from-env"
+    assert os.environ["EMPTY"] == ""
+    assert "export" not in os.environ
+
+    _mod._simple_load_dotenv(dotenv_path=env_file, override=True)
+    assert os.environ["KEEP"] == "from-file"
+
+
+def test_resolve_load_dotenv_prefers_python_dotenv(monkeypatch):
+    monkeypatch.setattr(_mod, "_python_dotenv_loader", lambda: _fake_load_dotenv)
+    assert _mod._resolve_load_dotenv() is _fake_load_dotenv
+
+
+def test_resolve_load_dotenv_falls_back_without_python_dotenv(monkeypatch):
+    monkeypatch.setattr(_mod, "_python_dotenv_loader", lambda: None)
+    assert _mod._resolve_load_dotenv() is _mod._simple_load_dotenv
+
+
 def test_find_dotenv_searches_parent_directories(tmp_path):
     root = tmp_path / "repo"
     nested = root / "skills" / "image-creation"
@@ -55,6 +86,47 @@ def test_find_dotenv_searches_parent_directories(tmp_path):
     assert found == env_file
 
 
+def test_find_dotenv_caches_walk_per_cwd_and_repo_root(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    nested = root / "a" / "b"
+    nested.mkdir(parents=True)
+    env_file = root / ".env"
+    env_file.write_text("A=1\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("ALEX_REPO_ROOT", raising=False)
+    _mod._find_dotenv_cached.cache_clear()
+
+    assert _mod.find_dotenv(nested) == env_file
+    assert _mod.find_dotenv(nested) == env_file
+    assert _mod._find_dotenv_cached.cache_info().hits == 1
+
+    nested_env = nested / ".env"
+    nested_env.write_text("A=2\n", encoding="utf-8")
+    monkeypatch.setenv("ALEX_REPO_ROOT", str(root))
+    assert _mod.find_dotenv(nested) == nested_env
+
+    nested_env.unlink()
+    assert _mod.find_dotenv(nested) == env_file
+
+
+def test_find_dotenv_checks_each_directory_once(tmp_path, monkeypatch):
+    script_dir = tmp_path / "a" / "skills" / "demo"
+    script_dir.mkdir(parents=True)
+    monkeypatch.chdir(tmp_path / "a")
+    monkeypatch.setenv("ALEX_REPO_ROOT", str(tmp_path))
+    _mod._find_dotenv_cached.cache_clear()
+    checked: list[str] = []
+    real_isfile = os.path.isfile
+
+    def counting_isfile(path):
+        checked.append(str(path))
+        return real_isfile(path)
+
+    monkeypatch.setattr(_mod.os.path, "isfile", counting_isfile)
+    _mod.find_dotenv(script_dir / "run.py")
+    assert len(checked) == len(set(checked))
+
+
 def test_load_repo_dotenv_preserves_existing_values_by_default(tmp_path, monkeypatch):
     env_file = tmp_path / ".env"
     env_file.write_text("ARK_API_KEY=from-file\n", encoding="utf-8")
@@ -33,6 +33,34 @@ def test_discover_skills_reads_front_matter_and_entrypoint(tmp_path):
     assert discovered[1].has_run_script is False
 
 
+def test_read_front_matter_scans_plain_fields_and_falls_back_to_yaml(tmp_path):
+    plain = tmp_path / "plain.md"
+    plain.write_text(
+        "---\nname: alpha\ndescription: Use it → done\ntriggers:\n  keywords: [a]\n---\n",
+        encoding="utf-8",
+    )
+    assert _mod._read_front_matter(plain) == {"name": "alpha", "description": "Use it → done"}
+
+    folded = tmp_path / "folded.md"
+    folded.write_text(
+        "---\nname: 'beta'\ndescription: >\n  line one\n  line two\n---\n", encoding="utf-8"
+    )
+    meta = _mod._read_front_matter(folded)
+    assert meta["name"] == "beta"
+    assert meta["description"] == "line one line two"
+
+
+def test_read_front_matter_reads_past_first_chunk(tmp_path, monkeypatch):
+    monkeypatch.setattr(_mod, "_FRONT_MATTER_READ_SIZE", 8)
+    skill_md = tmp_path / "SKILL.md"
+    skill_md.write_text("---\nname: gamma\ndescription: Long → header\n---\n# body\n", encoding="utf-8")
+    assert _mod._read_front_matter(skill_md) == {"name": "gamma", "description": "Long → header"}
+
+    unterminated = tmp_path / "open.md"
+    unterminated.write_text("---\nname: delta\n", encoding="utf-8")
+    assert _mod._read_front_matter(unterminated) == {}
+
+
 def test_build_cases_generates_expected_exec_command():
     skills = [
         _mod.SkillMeta(
@@ -69,3 +97,36 @@ def test_case_prompt_requires_skills_tool_only():
     assert "Call the `skills` tool with action=show and name=\"feishu-cli\"" in prompt
     assert "Do not call any tool except `skills`." in prompt
     assert "python3 skills/feishu-cli/run.py <command> [args]" in prompt
+
+
+def test_discover_skills_reuses_cached_front_matter_until_skill_md_changes(tmp_path, monkeypatch):
+    skill = tmp_path / "skills" / "alpha-skill"
+    skill.mkdir(parents=True)
+    skill_md = skill / "SKILL.md"
+    skill_md.write_text("---\nname: alpha\ndescription: First\n---\n", encoding="utf-8")
+    cache_path = tmp_path / "cache" / "meta.json"
+    assert _mod.discover_skills(tmp_path, cache_path)[0].description == "First"
+    assert cache_path.exists()
+
+    reads = []
+    real_read = _mod._read_front_matter
+    monkeypatch.setattr(_mod, "_read_front_matter", lambda path: reads.append(path) or real_read(path))
+    assert _mod.discover_skills(tmp_path, cache_path)[0].description == "First"
+    assert reads == []
+
+    skill_md.write_text("---\nname: alpha\ndescription: Second one\n---\n", encoding="utf-8")
+    assert _mod.discover_skills(tmp_path, cache_path)[0].description == "Second one"
+    assert reads == [skill_md]
+
+    monkeypatch.setattr(_mod, "_META_CACHE_VERSION", _mod._META_CACHE_VERSION + 1)
+    assert _mod.discover_skills(tmp_path, cache_path)[0].description == "Second one"
+    assert reads == [skill_md, skill_md]
+
+
+def test_discover_skills_writes_no_cache_by_default(tmp_path):
+    skill = tmp_path / "skills" / "alpha-skill"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: alpha\n---\n", encoding="utf-8")
+    before = sorted(p.relative_to(tmp_path) for p in tmp_path.rglob("*"))
+    assert _mod.discover_skills(tmp_path)[0].skill_name == "alpha"
+    assert sorted(p.relative_to(tmp_path) for p in tmp_path.rglob("*")) == before
@@ -14,18 +14,41 @@ if str(_SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(_SCRIPTS_DIR))
 
 from skill_runner.env import load_repo_dotenv
-from skill_runner.cli_contract import parse_cli_args, render_result
+from skill_runner.cli_contract import emit_result, parse_cli_args
 
 load_repo_dotenv(__file__)
 
 import os
-import time
 
 _ARTIFACTS_DIR = Path(os.environ.get("ALEX_ARTIFACTS_DIR", os.path.expanduser("~/.alex/artifacts")))
 
+_READ_LIMIT = 50000
+
+
+# Directory already created by _ensure_dir in this process.
+_ENSURED_DIR: Path | None = None
+
 
 def _ensure_dir():
+    global _ENSURED_DIR
+    if _ENSURED_DIR == _ARTIFACTS_DIR:
+        return
     _ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIR = _ARTIFACTS_DIR
+
+
+def _resolve(name: str) -> Path:
+    """Return the path for *name* in the artifacts dir; ValueError if it escapes.
+
+    Containment is checked on the resolved path, but the unresolved one is
+    returned so that deleting a symlink removes the link, not its target.
+    """
+    filepath = _ARTIFACTS_DIR / name
+    root = _ARTIFACTS_DIR.resolve()
+    resolved = filepath.resolve()
+    if resolved == root or not resolved.is_relative_to(root):
+        raise ValueError(f"artifact name '{name}' escapes {_ARTIFACTS_DIR}")
+    return filepath
 
 
 def create(args: dict) -> dict:
@@ -35,9 +58,15 @@ def create(args: dict) -> dict:
         return {"success": False, "error": "name is required"}
 
     _ensure_dir()
-    filepath = _ARTIFACTS_DIR / name
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    filepath.write_text(content, encoding="utf-8")
+    try:
+        filepath = _resolve(name)
+    except ValueError as exc:
+        return {"success": False, "error": str(exc)}
+    try:
+        filepath.write_text(content, encoding="utf-8")
+    except FileNotFoundError:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(content, encoding="utf-8")
 
     return {
         "success": True,
@@ -47,16 +76,31 @@ def create(args: dict) -> dict:
     }
 
 
+def _scan_files(directory: str, prefix: str = ""):
+    """Yield (relative name, stat) for every file below *directory*, one stat each."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_files(entry.path, name + os.sep)
+            elif entry.is_file():
+                yield name, entry.stat()
+
+
 def list_artifacts(_args: dict) -> dict:
+    import time  # only listing formats timestamps
+
     _ensure_dir()
-    artifacts = []
-    for f in sorted(_ARTIFACTS_DIR.rglob("*")):
-        if f.is_file():
-            artifacts.append({
-                "name": str(f.relative_to(_ARTIFACTS_DIR)),
-                "size": f.stat().st_size,
-                "modified": time.strftime("%Y-%m-%d %H:%M", time.localtime(f.stat().st_mtime)),
-            })
+    # Sort by path components, matching the previous sorted(rglob()) order.
+    files = sorted(_scan_files(str(_ARTIFACTS_DIR)), key=lambda item: item[0].split(os.sep))
+    artifacts = [
+        {
+            "name": name,
+            "size": st.st_size,
+            "modified": time.strftime("%Y-%m-%d %H:%M", time.localtime(st.st_mtime)),
+        }
+        for name, st in files
+    ]
     return {"success": True, "artifacts": artifacts, "count": len(artifacts)}
 
 
@@ -64,28 +108,36 @@ def read(args: dict) -> dict:
     name = args.get("name", "")
     if not name:
         return {"success": False, "error": "name is required"}
-    filepath = _ARTIFACTS_DIR / name
-    if not filepath.exists():
+    try:
+        # Only the first _READ_LIMIT characters are returned; don't load the rest.
+        with _resolve(name).open("r", encoding="utf-8", errors="replace") as fh:
+            content = fh.read(_READ_LIMIT)
+    except ValueError as exc:
+        return {"success": False, "error": str(exc)}
+    except (FileNotFoundError, IsADirectoryError):
         return {"success": False, "error": f"artifact '{name}' not found"}
-    content = filepath.read_text(encoding="utf-8", errors="replace")
-    return {"success": True, "name": name, "content": content[:50000]}
+    return {"success": True, "name": name, "content": content}
 
 
 def delete(args: dict) -> dict:
     name = args.get("name", "")
     if not name:
         return {"success": False, "error": "name is required"}
-    filepath = _ARTIFACTS_DIR / name
-    if not filepath.exists():
+    try:
+        _resolve(name).unlink()
+    except ValueError as exc:
+        return {"success": False, "error": str(exc)}
+    except (FileNotFoundError, IsADirectoryError):
         return {"success": False, "error": f"artifact '{name}' not found"}
-    filepath.unlink()
     return {"success": True, "message": f"工件「{name}」已删除"}
 
 
+_HANDLERS = {"create": create, "list": list_artifacts, "read": read, "delete": delete}
+
+
 def run(args: dict) -> dict:
     action = args.pop("action", "list")
-    handlers = {"create": create, "list": list_artifacts, "read": read, "delete": delete}
-    handler = handlers.get(action)
+    handler = _HANDLERS.get(action)
     if not handler:
         return {"success": False, "error": f"unknown action: {action}"}
     return handler(args)
@@ -93,17 +145,7 @@ def run(args: dict) -> dict:
 
 def main() -> None:
     args = parse_cli_args(sys.argv[1:])
-    result = run(args)
-    stdout_text, stderr_text, exit_code = render_result(result)
-    if stdout_text:
-        sys.stdout.write(stdout_text)
-        if not stdout_text.endswith("\n"):
-            sys.stdout.write("\n")
-    if stderr_text:
-        sys.stderr.write(stderr_text)
-        if not stderr_text.endswith("\n"):
-            sys.stderr.write("\n")
-    sys.exit(exit_code)
+    emit_result(run(args))
 
 
 if __name__ == "__main__":
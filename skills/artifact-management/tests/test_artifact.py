@@ -41,6 +41,16 @@ class TestCreate:
         assert (tmp_path / "sub" / "report.md").exists()
 
 
+class TestPathContainment:
+    @pytest.mark.parametrize("name", ["../escape.md", "/etc/passwd", "sub/../../x.md", "."])
+    def test_rejects_names_outside_store(self, name, tmp_path):
+        for handler in (create, read, delete):
+            result = handler({"name": name, "content": "x"})
+            assert result["success"] is False
+            assert "escapes" in result["error"]
+        assert not (tmp_path.parent / "escape.md").exists()
+
+
 class TestListArtifacts:
     def test_empty(self):
         result = list_artifacts({})
@@ -53,6 +63,35 @@ class TestListArtifacts:
         result = list_artifacts({})
         assert result["count"] == 2
 
+    def test_lists_nested_in_path_order(self):
+        for name in ("b.md", "a-b.md", "a/x.md", "a/c/y.md"):
+            create({"name": name, "content": name})
+        result = list_artifacts({})
+        names = [item["name"] for item in result["artifacts"]]
+        assert names == ["a/c/y.md", "a/x.md", "a-b.md", "b.md"]
+        assert result["artifacts"][0]["size"] == len("a/c/y.md")
+
+
+class TestEnsureDir:
+    def test_mkdir_runs_once_per_directory(self, tmp_path, monkeypatch):
+        calls = []
+        real_mkdir = Path.mkdir
+
+        def counting_mkdir(self, *args, **kwargs):
+            calls.append(self)
+            return real_mkdir(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+        list_artifacts({})
+        list_artifacts({})
+        assert calls == [tmp_path]
+
+        other = tmp_path / "other"
+        monkeypatch.setattr(_mod, "_ARTIFACTS_DIR", other)
+        list_artifacts({})
+        assert calls == [tmp_path, other]
+        assert other.is_dir()
+
 
 class TestRead:
     def test_missing_name(self):
@@ -69,6 +108,12 @@ class TestRead:
         assert result["success"] is True
         assert result["content"] == "Hello"
 
+    def test_truncates_large_content(self, tmp_path):
+        (tmp_path / "big.log").write_text("é" * (_mod._READ_LIMIT + 10), encoding="utf-8")
+        result = read({"name": "big.log"})
+        assert result["success"] is True
+        assert result["content"] == "é" * _mod._READ_LIMIT
+
 
 class TestDelete:
     def test_missing_name(self):
@@ -86,6 +131,14 @@ class TestDelete:
         assert result["success"] is True
         assert not (tmp_path / "temp.md").exists()
 
+    def test_deletes_symlink_not_its_target(self, tmp_path):
+        create({"name": "target.md", "content": "keep"})
+        (tmp_path / "link.md").symlink_to(tmp_path / "target.md")
+        result = delete({"name": "link.md"})
+        assert result["success"] is True
+        assert not (tmp_path / "link.md").is_symlink()
+        assert (tmp_path / "target.md").read_text(encoding="utf-8") == "keep"
+
 
 class TestRun:
     def test_default_action_is_list(self):
@@ -12,12 +12,37 @@ _SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "scripts"
 if str(_SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(_SCRIPTS_DIR))
 
-from skill_runner.cli_contract import parse_cli_args, render_result
+from skill_runner.cli_contract import emit_result, parse_cli_args
 
 
 def _run(cmd: list[str]) -> tuple[int, str, str]:
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    return result.returncode, result.stdout, result.stderr
+    # say/afconvert report problems on stderr; their stdout is never used.
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False)
+    return result.returncode, "", result.stderr
+
+
+def _non_empty(path: str) -> bool:
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
+
+
+def _say_via_aiff(output: str, voice_opts: list[str], text: str) -> str:
+    """Fallback: render AIFF with say, then convert to m4a. Returns an error or ""."""
+    tmp_aiff = f"/tmp/tts_{int(time.time())}.aiff"
+    code, _, err = _run(["say", "-o", tmp_aiff, *voice_opts, text])
+    if code != 0:
+        return f"say failed: {err.strip()}"
+
+    code, _, err = _run(["afconvert", "-f", "m4af", "-d", "aac", tmp_aiff, output])
+    with contextlib.suppress(Exception):
+        os.remove(tmp_aiff)
+    if code != 0:
+        return f"afconvert failed: {err.strip()}"
+    if not _non_empty(output):
+        return "output file missing or empty"
+    return ""
 
 
 def speak(args: dict) -> dict:
@@ -29,30 +54,23 @@ def speak(args: dict) -> dict:
     rate = args.get("rate")
     output = str(args.get("output", "")) or f"/tmp/tts_{int(time.time())}.m4a"
 
-    tmp_aiff = f"/tmp/tts_{int(time.time())}.aiff"
-    say_cmd = ["say", "-o", tmp_aiff]
+    voice_opts: list[str] = []
     if voice:
-        say_cmd += ["-v", voice]
+        voice_opts += ["-v", voice]
     if rate is not None:
         try:
-            say_cmd += ["-r", str(int(rate))]
+            voice_opts += ["-r", str(int(rate))]
         except Exception:
             return {"success": False, "error": "rate must be int"}
-    say_cmd += [text]
 
-    code, _, err = _run(say_cmd)
-    if code != 0:
-        return {"success": False, "error": f"say failed: {err.strip()}"}
-
-    # convert to m4a
     Path(output).parent.mkdir(parents=True, exist_ok=True)
-    code, _, err = _run(["afconvert", "-f", "m4af", "-d", "aac", tmp_aiff, output])
-    with contextlib.suppress(Exception):
-        os.remove(tmp_aiff)
-    if code != 0:
-        return {"success": False, "error": f"afconvert failed: {err.strip()}"}
-    if not Path(output).exists() or Path(output).stat().st_size == 0:
-        return {"success": False, "error": "output file missing or empty"}
+
+    # say can encode AAC/m4a itself, skipping the AIFF intermediate and afconvert.
+    code, _, _ = _run(["say", "-o", output, "--file-format=m4af", "--data-format=aac", *voice_opts, text])
+    if code != 0 or not _non_empty(output):
+        error = _say_via_aiff(output, voice_opts, text)
+        if error:
+            return {"success": False, "error": error}
 
     return {
         "success": True,
@@ -72,17 +90,7 @@ def run(args: dict) -> dict:
 
 def main() -> None:
     args = parse_cli_args(sys.argv[1:])
-    result = run(args)
-    stdout_text, stderr_text, exit_code = render_result(result)
-    if stdout_text:
-        sys.stdout.write(stdout_text)
-        if not stdout_text.endswith("\n"):
-            sys.stdout.write("\n")
-    if stderr_text:
-        sys.stderr.write(stderr_text)
-        if not stderr_text.endswith("\n"):
-            sys.stderr.write("\n")
-    sys.exit(exit_code)
+    emit_result(run(args))
 
 
 if __name__ == "__main__":
@@ -32,3 +32,45 @@ def test_speak_success_creates_output(tmp_path):
     assert result["success"] is True
     assert result["audio_path"] == str(output)
     assert output.exists()
+
+
+def test_run_discards_stdout_and_keeps_stderr():
+    code, out, err = _mod._run(["sh", "-c", "echo noisy; echo broken >&2; exit 3"])
+    assert (code, out, err.strip()) == (3, "", "broken")
+
+
+def test_speak_writes_m4a_in_one_say_call(tmp_path):
+    output = tmp_path / "tts.m4a"
+    calls: list[list[str]] = []
+
+    def fake_run(cmd: list[str]):
+        calls.append(cmd)
+        Path(output).write_bytes(b"audio")
+        return 0, "", ""
+
+    with patch.object(_mod, "_run", side_effect=fake_run):
+        result = _mod.speak({"text": "hello", "output": str(output), "voice": "Ting-Ting"})
+
+    assert result["success"] is True
+    assert len(calls) == 1
+    assert calls[0][:5] == ["say", "-o", str(output), "--file-format=m4af", "--data-format=aac"]
+    assert calls[0][-3:] == ["-v", "Ting-Ting", "hello"]
+
+
+def test_speak_falls_back_to_afconvert_when_say_cannot_encode(tmp_path):
+    output = tmp_path / "tts.m4a"
+    calls: list[str] = []
+
+    def fake_run(cmd: list[str]):
+        calls.append(cmd[0])
+        if "--file-format=m4af" in cmd:
+            return 1, "", "Opening output file failed"
+        if cmd[0] == "afconvert":
+            Path(cmd[-1]).write_bytes(b"audio")
+        return 0, "", ""
+
+    with patch.object(_mod, "_run", side_effect=fake_run):
+        result = _mod.speak({"text": "hello", "output": str(output)})
+
+    assert result["success"] is True
+    assert calls == ["say", "say", "afconvert"]
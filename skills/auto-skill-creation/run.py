@@ -16,38 +16,21 @@ if str(_SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(_SCRIPTS_DIR))
 
 from skill_runner.env import load_repo_dotenv
-from skill_runner.cli_contract import parse_cli_args, render_result
+from skill_runner.cli_contract import emit_result, parse_cli_args
 
 load_repo_dotenv(__file__)
 
 _SKILLS_DIR = Path(os.environ.get("ALEX_SKILLS_DIR", Path(__file__).resolve().parent.parent))
 
-
-def create(args: dict) -> dict:
-    name = args.get("name", "")
-    description = args.get("description", "")
-    if not name or not description:
-        return {"success": False, "error": "name and description are required"}
-
-    skill_dir = _SKILLS_DIR / name
-    if skill_dir.exists():
-        return {"success": False, "error": f"skill {name} already exists at {skill_dir}"}
-
-    skill_dir.mkdir(parents=True)
-    tests_dir = skill_dir / "tests"
-    tests_dir.mkdir()
-
-    # SKILL.md
-    keywords = args.get("keywords", [name.replace("-", " ")])
-    triggers = args.get("triggers", [name.replace("-", "|")])
-    (skill_dir / "SKILL.md").write_text(f"""---
+# 脚手架模板：import 时组装一次，create() 中用 format_map 填充
+_SKILL_MD_TMPL = """---
 name: {name}
 description: {description}
 triggers:
   intent_patterns:
-    - "{"|".join(triggers)}"
+    - "{triggers}"
   context_signals:
-    keywords: {json.dumps(keywords, ensure_ascii=False)}
+    keywords: {keywords}
   confidence_threshold: 0.6
 priority: 5
 requires_tools: [bash]
@@ -64,10 +47,9 @@ cooldown: 60
 ```bash
 python3 skills/{name}/run.py default --key value
 ```
-""", encoding="utf-8")
+"""
 
-    # run.py
-    (skill_dir / "run.py").write_text(f'''#!/usr/bin/env python3
+_RUN_PY_TMPL = '''#!/usr/bin/env python3
 """{name} skill — {description}"""
 
 from __future__ import annotations
@@ -80,7 +62,7 @@ if str(_SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(_SCRIPTS_DIR))
 
 from skill_runner.env import load_repo_dotenv
-from skill_runner.cli_contract import parse_cli_args, render_result
+from skill_runner.cli_contract import emit_result, parse_cli_args
 
 load_repo_dotenv(__file__)
 
@@ -94,29 +76,14 @@ def run(args: dict) -> dict:
 
 def main() -> None:
     args = parse_cli_args(sys.argv[1:])
-    result = run(args)
-    stdout_text, stderr_text, exit_code = render_result(result)
-    if stdout_text:
-        sys.stdout.write(stdout_text)
-        if not stdout_text.endswith("\\n"):
-            sys.stdout.write("\\n")
-    if stderr_text:
-        sys.stderr.write(stderr_text)
-        if not stderr_text.endswith("\\n"):
-            sys.stderr.write("\\n")
-    sys.exit(exit_code)
+    emit_result(run(args))
 
 
 if __name__ == "__main__":
     main()
-''', encoding="utf-8")
+'''
 
-    # tests/__init__.py
-    (tests_dir / "__init__.py").write_text("", encoding="utf-8")
-
-    # tests/test_{name}.py
-    test_name = name.replace("-", "_")
-    (tests_dir / f"test_{test_name}.py").write_text(f'''"""Tests for {name} skill."""
+_TEST_PY_TMPL = '''"""Tests for {name} skill."""
 
 from __future__ import annotations
 
@@ -139,7 +106,45 @@ class TestRun:
     def test_unknown_action(self):
         result = run({{"action": "invalid"}})
         assert result["success"] is False
-''', encoding="utf-8")
+'''
+
+
+def create(args: dict) -> dict:
+    name = args.get("name", "")
+    description = args.get("description", "")
+    if not name or not description:
+        return {"success": False, "error": "name and description are required"}
+
+    skill_dir = _SKILLS_DIR / name
+    if skill_dir.exists():
+        return {"success": False, "error": f"skill {name} already exists at {skill_dir}"}
+
+    skill_dir.mkdir(parents=True)
+    tests_dir = skill_dir / "tests"
+    tests_dir.mkdir()
+
+    keywords = args.get("keywords", [name.replace("-", " ")])
+    triggers = args.get("triggers", [name.replace("-", "|")])
+    test_name = name.replace("-", "_")
+    ctx = {
+        "name": name,
+        "description": description,
+        "triggers": "|".join(triggers),
+        "keywords": json.dumps(keywords, ensure_ascii=False),
+        "test_name": test_name,
+    }
+
+    # SKILL.md
+    (skill_dir / "SKILL.md").write_text(_SKILL_MD_TMPL.format_map(ctx), encoding="utf-8")
+
+    # run.py
+    (skill_dir / "run.py").write_text(_RUN_PY_TMPL.format_map(ctx), encoding="utf-8")
+
+    # tests/__init__.py
+    (tests_dir / "__init__.py").write_text("", encoding="utf-8")
+
+    # tests/test_{name}.py
+    (tests_dir / f"test_{test_name}.py").write_text(_TEST_PY_TMPL.format_map(ctx), encoding="utf-8")
 
     return {
         "success": True,
@@ -158,17 +163,7 @@ def run(args: dict) -> dict:
 
 def main() -> None:
     args = parse_cli_args(sys.argv[1:])
-    result = run(args)
-    stdout_text, stderr_text, exit_code = render_result(result)
-    if stdout_text:
-        sys.stdout.write(stdout_text)
-        if not stdout_text.endswith("\n"):
-            sys.stdout.write("\n")
-    if stderr_text:
-        sys.stderr.write(stderr_text)
-        if not stderr_text.endswith("\n"):
-            sys.stderr.write("\n")
-    sys.exit(exit_code)
+    emit_result(run(args))
 
 
 if __name__ == "__main__":
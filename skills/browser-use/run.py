@@ -23,7 +23,7 @@ if str(_SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(_SCRIPTS_DIR))
 
 from skill_runner.env import load_repo_dotenv
-from skill_runner.cli_contract import parse_cli_args, render_result
+from skill_runner.cli_contract import emit_result, parse_cli_args
 
 load_repo_dotenv(__file__)
 
@@ -345,17 +345,7 @@ def run(args: dict) -> dict:
 
 def main() -> None:
     args = parse_cli_args(sys.argv[1:])
-    result = run(args)
-    stdout_text, stderr_text, exit_code = render_result(result)
-    if stdout_text:
-        sys.stdout.write(stdout_text)
-        if not stdout_text.endswith("\n"):
-            sys.stdout.write("\n")
-    if stderr_text:
-        sys.stderr.write(stderr_text)
-        if not stderr_text.endswith("\n"):
-            sys.stderr.write("\n")
-    sys.exit(exit_code)
+    emit_result(run(args))
 
 
 if __name__ == "__main__":
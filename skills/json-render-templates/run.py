@@ -14,14 +14,16 @@ if str(_SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(_SCRIPTS_DIR))
 
 from skill_runner.env import load_repo_dotenv
-from skill_runner.cli_contract import parse_cli_args, render_result
+from skill_runner.cli_contract import emit_result, parse_cli_args
 
 load_repo_dotenv(__file__)
 
-import json
+from typing import Callable
 
-_TEMPLATES = {
-    "flowchart": {
+# Each entry builds a fresh template, so callers may mutate what they get
+# without a deep copy of shared state.
+_TEMPLATES: dict[str, Callable[[], dict]] = {
+    "flowchart": lambda: {
         "type": "flowchart",
         "nodes": [
             {"id": "start", "label": "开始", "type": "start"},
@@ -33,7 +35,7 @@ _TEMPLATES = {
             {"from": "step1", "to": "end"},
         ],
     },
-    "form": {
+    "form": lambda: {
         "type": "form",
         "title": "表单标题",
         "fields": [
@@ -43,7 +45,7 @@ _TEMPLATES = {
         ],
         "submit": {"label": "提交", "action": "submit"},
     },
-    "dashboard": {
+    "dashboard": lambda: {
         "type": "dashboard",
         "title": "数据面板",
         "widgets": [
@@ -52,13 +54,13 @@ _TEMPLATES = {
             {"type": "chart", "chart_type": "line", "data": []},
         ],
     },
-    "cards": {
+    "cards": lambda: {
         "type": "cards",
         "items": [
             {"title": "卡片 1", "description": "描述", "image": "", "actions": [{"label": "查看"}]},
         ],
     },
-    "table": {
+    "table": lambda: {
         "type": "table",
         "columns": [
             {"key": "name", "label": "名称"},
@@ -70,23 +72,26 @@ _TEMPLATES = {
 }
 
 
+# Field a "data" argument replaces, for templates that accept one.
+_DATA_KEY = {"table": "rows", "cards": "items"}
+
+
 def generate(args: dict) -> dict:
     template_type = args.get("template", "")
     if not template_type:
         return {"success": True, "available": list(_TEMPLATES.keys()), "message": "specify template type"}
-    template = _TEMPLATES.get(template_type)
-    if not template:
+    build = _TEMPLATES.get(template_type)
+    if build is None:
         return {"success": False, "error": f"unknown template: {template_type}, available: {list(_TEMPLATES.keys())}"}
 
     # Apply customizations
-    result = json.loads(json.dumps(template))  # deep copy
+    result = build()
     if args.get("title"):
         result["title"] = args["title"]
     if args.get("data"):
-        if "rows" in result:
-            result["rows"] = args["data"]
-        elif "items" in result:
-            result["items"] = args["data"]
+        data_key = _DATA_KEY.get(template_type)
+        if data_key is not None:
+            result[data_key] = args["data"]
 
     return {"success": True, "template": result, "type": template_type}
 
@@ -102,17 +107,7 @@ def run(args: dict) -> dict:
 
 def main() -> None:
     args = parse_cli_args(sys.argv[1:])
-    result = run(args)
-    stdout_text, stderr_text, exit_code = render_result(result)
-    if stdout_text:
-        sys.stdout.write(stdout_text)
-        if not stdout_text.endswith("\n"):
-            sys.stdout.write("\n")
-    if stderr_text:
-        sys.stderr.write(stderr_text)
-        if not stderr_text.endswith("\n"):
-            sys.stderr.write("\n")
-    sys.exit(exit_code)
+    emit_result(run(args))
 
 
 if __name__ == "__main__":
@@ -67,11 +67,24 @@ class TestGenerate:
         result = generate({"template": "cards", "data": data})
         assert result["template"]["items"] == data
 
+    def test_data_ignored_without_data_key(self):
+        result = generate({"template": "form", "data": [{"x": 1}]})
+        assert len(result["template"]["fields"]) == 3
+        assert "rows" not in result["template"] and "items" not in result["template"]
+
     def test_deep_copy_isolation(self):
         result1 = generate({"template": "table", "data": [{"x": 1}]})
         result2 = generate({"template": "table"})
         assert result1["template"]["rows"] != result2["template"]["rows"]
 
+    def test_nested_mutation_does_not_leak(self):
+        first = generate({"template": "form"})
+        first["template"]["fields"][0]["label"] = "changed"
+        first["template"]["submit"]["label"] = "changed"
+        second = generate({"template": "form"})
+        assert second["template"]["fields"][0]["label"] == "姓名"
+        assert second["template"]["submit"]["label"] == "提交"
+
 
 class TestRun:
     def test_default_action_is_generate(self):
@@ -16,7 +16,7 @@ if str(_SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(_SCRIPTS_DIR))
 
 from skill_runner.env import load_repo_dotenv
-from skill_runner.cli_contract import parse_cli_args, render_result
+from skill_runner.cli_contract import emit_result, parse_cli_args
 
 load_repo_dotenv(__file__)
 
@@ -36,17 +36,89 @@ def _ensure_plan_store() -> None:
         _PLAN_STORE_PATH.write_text("[]\n", encoding="utf-8")
 
 
-def _load_plans() -> list[dict[str, Any]]:
+# Plan mutations are appended to a JSON-lines journal beside the snapshot
+# (plans.json -> plans.log) and replayed on load; the snapshot is rewritten
+# and the journal dropped once it holds this many records.
+_JOURNAL_COMPACT_AT = 512
+
+
+def _journal_path() -> Path:
+    return _PLAN_STORE_PATH.with_suffix(".log")
+
+
+def _plan_key(plan: dict[str, Any]) -> str:
+    return str(plan.get("id", "")).strip()
+
+
+def _load_store() -> tuple[list[dict[str, Any]], int]:
+    """Return the snapshot with the journal replayed, and the journal length."""
     _ensure_plan_store()
-    return json.loads(_PLAN_STORE_PATH.read_text(encoding="utf-8"))
+    plans = json.loads(_PLAN_STORE_PATH.read_text(encoding="utf-8"))
+    try:
+        raw = _journal_path().read_bytes()
+    except FileNotFoundError:
+        return plans, 0
+
+    by_key: dict[Any, dict[str, Any]] = {}
+    for index, plan in enumerate(plans):
+        key = _plan_key(plan)
+        by_key[key if key and key not in by_key else ("", index)] = plan
+
+    lines = raw.split(b"\n")
+    # An append cut short by a crash leaves an unterminated last line; drop it
+    # and compact so the next append does not land on the torn fragment.
+    torn = lines.pop() != b""
+    records = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        records += 1
+        record = json.loads(line)
+        if record["op"] == "put":
+            by_key[_plan_key(record["plan"])] = record["plan"]
+        else:
+            by_key.pop(record["id"], None)
+
+    plans = list(by_key.values())
+    if torn:
+        _save_plans(plans)
+        return plans, 0
+    return plans, records
+
+
+def _load_plans() -> list[dict[str, Any]]:
+    return _load_store()[0]
 
 
 def _save_plans(plans: list[dict[str, Any]]) -> None:
+    """Rewrite the snapshot and drop the journal it now covers."""
     _ensure_plan_store()
-    _PLAN_STORE_PATH.write_text(
+    tmp = _PLAN_STORE_PATH.with_name(_PLAN_STORE_PATH.name + ".tmp")
+    tmp.write_text(
         json.dumps(plans, ensure_ascii=False, indent=2) + "\n",
         encoding="utf-8",
     )
+    os.replace(tmp, _PLAN_STORE_PATH)
+    _journal_path().unlink(missing_ok=True)
+
+
+def _commit(plans: list[dict[str, Any]], records: list[dict[str, Any]], journal_len: int) -> None:
+    """Persist a mutation of *plans* by journaling *records*, or compact.
+
+    Plans without an id cannot be addressed by a journal record, so changes
+    touching them rewrite the snapshot instead.
+    """
+    keyed = all(
+        _plan_key(record["plan"]) if record["op"] == "put" else record["id"] for record in records
+    )
+    if not keyed or journal_len + len(records) > _JOURNAL_COMPACT_AT:
+        _save_plans(plans)
+        return
+    payload = "".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records
+    )
+    with _journal_path().open("ab") as f:
+        f.write(payload.encode("utf-8"))
 
 
 def _now_iso() -> str:
@@ -86,7 +158,7 @@ def upsert_plan(args: dict[str, Any]) -> dict[str, Any]:
     if not name or not schedule or not task:
         return {"success": False, "error": "name, schedule, task are required"}
 
-    plans = _load_plans()
+    plans, journal_len = _load_store()
     now = _now_iso()
 
     for plan in plans:
@@ -101,7 +173,7 @@ def upsert_plan(args: dict[str, Any]) -> dict[str, Any]:
         if incoming_next_run:
             plan["next_run_at"] = incoming_next_run
         plan["updated_at"] = now
-        _save_plans(plans)
+        _commit(plans, [{"op": "put", "plan": plan}], journal_len)
         return {"success": True, "action": "updated", "plan": plan, "event": "reminder.plan_upserted"}
 
     plan = {
@@ -118,7 +190,7 @@ def upsert_plan(args: dict[str, Any]) -> dict[str, Any]:
         "next_run_at": str(args.get("next_run_at", "")).strip(),
     }
     plans.append(plan)
-    _save_plans(plans)
+    _commit(plans, [{"op": "put", "plan": plan}], journal_len)
     return {"success": True, "action": "created", "plan": plan, "event": "reminder.plan_upserted"}
 
 
@@ -133,17 +205,19 @@ def delete_plan(args: dict[str, Any]) -> dict[str, Any]:
     if not name and not plan_id:
         return {"success": False, "error": "name or id is required"}
 
-    plans = _load_plans()
-    remain = [
-        plan
-        for plan in plans
-        if not _plan_matches_identity(plan, name=name, plan_id=plan_id)
-    ]
-    removed = len(plans) - len(remain)
+    plans, journal_len = _load_store()
+    remain: list[dict[str, Any]] = []
+    records: list[dict[str, Any]] = []
+    for plan in plans:
+        if _plan_matches_identity(plan, name=name, plan_id=plan_id):
+            records.append({"op": "delete", "id": _plan_key(plan)})
+        else:
+            remain.append(plan)
+    removed = len(records)
     if removed == 0:
         return {"success": False, "error": "plan not found"}
 
-    _save_plans(remain)
+    _commit(remain, records, journal_len)
     return {"success": True, "removed": removed, "event": "reminder.plan_deleted"}
 
 
@@ -172,7 +246,7 @@ def touch_plan(args: dict[str, Any]) -> dict[str, Any]:
     if not name and not plan_id:
         return {"success": False, "error": "name or id is required"}
 
-    plans = _load_plans()
+    plans, journal_len = _load_store()
     now = _now_iso()
     for plan in plans:
         if not _plan_matches_identity(plan, name=name, plan_id=plan_id):
@@ -181,7 +255,7 @@ def touch_plan(args: dict[str, Any]) -> dict[str, Any]:
         if next_run_at:
             plan["next_run_at"] = next_run_at
         plan["updated_at"] = now
-        _save_plans(plans)
+        _commit(plans, [{"op": "put", "plan": plan}], journal_len)
         return {"success": True, "plan": plan}
 
     return {"success": False, "error": "plan not found"}
@@ -240,16 +314,7 @@ def _load_main_args() -> tuple[dict[str, Any], dict[str, Any] | None]:
 def main() -> None:
     args, early_result = _load_main_args()
     result = early_result if early_result is not None else run(args)
-    stdout_text, stderr_text, exit_code = render_result(result)
-    if stdout_text:
-        sys.stdout.write(stdout_text)
-        if not stdout_text.endswith("\n"):
-            sys.stdout.write("\n")
-    if stderr_text:
-        sys.stderr.write(stderr_text)
-        if not stderr_text.endswith("\n"):
-            sys.stderr.write("\n")
-    sys.exit(exit_code)
+    emit_result(result)
 
 
 if __name__ == "__main__":
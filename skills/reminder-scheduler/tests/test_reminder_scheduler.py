@@ -207,3 +207,50 @@ class TestPlanLifecycle:
         plans = _mod.list_plans({})["plans"]
         assert plans[0]["next_run_at"] == ""
         assert plans[1]["next_run_at"] == ""
+
+
+class TestPlanJournal:
+    def test_mutations_append_to_journal_without_rewriting_snapshot(self, tmp_path):
+        created = _mod.upsert_plan({"name": "a", "schedule": "*", "task": "t"})
+        _mod.upsert_plan({"name": "b", "schedule": "*", "task": "t"})
+        _mod.touch_plan({"name": "a", "next_run_at": "2026-03-12T10:00:00Z"})
+        _mod.delete_plan({"name": "b"})
+
+        assert (tmp_path / "plans.json").read_text(encoding="utf-8") == "[]\n"
+        journal = (tmp_path / "plans.log").read_text(encoding="utf-8").splitlines()
+        assert len(journal) == 4
+
+        plans = _mod.list_plans({})["plans"]
+        assert [plan["id"] for plan in plans] == [created["plan"]["id"]]
+        assert plans[0]["next_run_at"] == "2026-03-12T10:00:00Z"
+
+    def test_journal_is_compacted_into_snapshot(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(_mod, "_JOURNAL_COMPACT_AT", 2)
+        _mod.upsert_plan({"name": "a", "schedule": "*", "task": "t"})
+        _mod.upsert_plan({"name": "b", "schedule": "*", "task": "t"})
+        _mod.upsert_plan({"name": "c", "schedule": "*", "task": "t"})
+
+        assert not (tmp_path / "plans.log").exists()
+        snapshot = _mod.json.loads((tmp_path / "plans.json").read_text(encoding="utf-8"))
+        assert [plan["name"] for plan in snapshot] == ["a", "b", "c"]
+
+    def test_torn_journal_tail_is_dropped(self, tmp_path):
+        _mod.upsert_plan({"name": "a", "schedule": "*", "task": "t"})
+        with (tmp_path / "plans.log").open("a", encoding="utf-8") as f:
+            f.write('{"op":"put","plan":{"id":"x"')
+
+        assert [plan["name"] for plan in _mod.list_plans({})["plans"]] == ["a"]
+        assert not (tmp_path / "plans.log").exists()
+        _mod.upsert_plan({"name": "b", "schedule": "*", "task": "t"})
+        assert _mod.list_plans({})["count"] == 2
+
+    def test_plan_without_id_is_rewritten_in_snapshot(self, tmp_path):
+        (tmp_path / "plans.json").write_text(
+            '[{"name": "legacy", "schedule": "*", "task": "t", "enabled": true}]\n',
+            encoding="utf-8",
+        )
+        touched = _mod.touch_plan({"name": "legacy", "next_run_at": "2026-03-12T10:00:00Z"})
+
+        assert touched["success"] is True
+        assert not (tmp_path / "plans.log").exists()
+        assert _mod.list_plans({})["plans"][0]["next_run_at"] == "2026-03-12T10:00:00Z"